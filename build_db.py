@@ -10,12 +10,16 @@ Usage:
 Can be re-run to rebuild the database (deletes and recreates the collection).
 """
 
-import json
 import os
 import sys
 
 import chromadb
+import numpy as np
+import orjson
+import torch
 from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+from sentence_transformers import SentenceTransformer
+from tqdm import tqdm
 
 from config import (
     CHROMA_COLLECTION_NAME,
@@ -23,8 +27,43 @@ from config import (
     EMBEDDING_MODEL,
     LISTINGS_JSON,
     SECTIONS_JSON,
+    TOP_K,
+    get_embedding_model_kwargs,
 )
 
+# Number of documents per collection.add() call
+ADD_BATCH_SIZE = 200
+
+# Number of documents per forward pass when computing embeddings
+ENCODE_BATCH_SIZE = 64
+
+# HNSW index settings — sized for a corpus of a few hundred documents.
+# search_ef should be at least 2x the number of results requested (TOP_K per
+# sub-query); at this size a generous construction_ef costs next to nothing.
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 128,
+    "hnsw:search_ef": max(64, 2 * TOP_K),
+    "hnsw:batch_size": ADD_BATCH_SIZE,
+    "hnsw:sync_threshold": 1000,
+}
+
+
+def _listing_metadata(listing: dict) -> dict:
+    """Build Chroma metadata for a listing, including Section 2.00 subsection info."""
+    meta = {
+        "listing_number": listing["listing_number"],
+        "body_system": listing["body_system"],
+        "section_number": listing["section_number"],
+        "doc_type": "listing",
+        "source_url": listing.get("source_url", ""),
+    }
+    if "subsection" in listing:
+        meta["subsection"] = listing["subsection"]
+        meta["subsection_topic"] = listing.get("subsection_topic", "")
+    return meta
+
 
 def build_database():
     """Build/rebuild the ChromaDB collection from JSON data."""
@@ -42,10 +81,10 @@ def build_database():
 
     # Load data
     print("Loading Blue Book data from JSON files...")
-    with open(LISTINGS_JSON, "r", encoding="utf-8") as f:
-        listings = json.load(f)
-    with open(SECTIONS_JSON, "r", encoding="utf-8") as f:
-        sections = json.load(f)
+    with open(LISTINGS_JSON, "rb") as f:
+        listings = orjson.loads(f.read())
+    with open(SECTIONS_JSON, "rb") as f:
+        sections = orjson.loads(f.read())
 
     print(f"  Loaded {len(listings)} listings and {len(sections)} section intros")
 
@@ -53,9 +92,23 @@ def build_database():
     # First run will download the model (~80MB)
     print(f"\nInitializing embedding model: {EMBEDDING_MODEL}")
     print("  (First run will download the model, this may take a minute...)")
-    embedding_fn = SentenceTransformerEmbeddingFunction(model_name=EMBEDDING_MODEL)
-
-    # Create persistent ChromaDB client
+    # Use every core for CPU inference (torch defaults to fewer on some hosts)
+    torch.set_num_threads(os.cpu_count() or 1)
+    model_kwargs = get_embedding_model_kwargs()
+    # Chroma's embedding function defaults to CPU, so pick the device explicitly
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    embedding_fn = SentenceTransformerEmbeddingFunction(
+        model_name=EMBEDDING_MODEL, device=device, **model_kwargs
+    )
+    # Half precision roughly doubles GPU throughput for the indexing pass, but
+    # needs its own model copy; otherwise reuse the embedding function's model
+    fp16_model = None
+    if device == "cuda" and not model_kwargs:
+        fp16_model = SentenceTransformer(EMBEDDING_MODEL, device=device).half()
+
+    # Create persistent ChromaDB client.
+    # Note: SQLite PRAGMA tuning isn't possible here — Chroma 1.x manages its
+    # SQLite connection in the Rust core. Batched add() keeps commits few anyway.
     print(f"\nSetting up ChromaDB at: {CHROMA_DB_PATH}")
     client = chromadb.PersistentClient(path=CHROMA_DB_PATH)
 
@@ -70,59 +123,68 @@ def build_database():
     collection = client.create_collection(
         name=CHROMA_COLLECTION_NAME,
         embedding_function=embedding_fn,
-        metadata={"hnsw:space": "cosine"},
+        metadata=HNSW_METADATA,
     )
     print(f"  Created collection: '{CHROMA_COLLECTION_NAME}'")
 
-    # Add listings
-    print(f"\nAdding {len(listings)} listings to database...")
-    for i, listing in enumerate(listings):
-        # Combine title + full text + summary for better embedding quality
-        doc_text = (
-            f"{listing['title']}\n\n"
-            f"{listing['full_text']}\n\n"
-            f"Summary: {listing['criteria_summary']}"
+    # Collect listings into parallel lists so they can be inserted in batches.
+    # Combine title + full text + summary for better embedding quality
+    documents = [
+        "\n\n".join(
+            (l["title"], l["full_text"], "Summary: " + l["criteria_summary"])
         )
-
-        # Build metadata — include subsection info if present (Section 2.00 splits)
-        meta = {
-            "listing_number": listing["listing_number"],
-            "body_system": listing["body_system"],
-            "section_number": listing["section_number"],
-            "doc_type": "listing",
-            "source_url": listing.get("source_url", ""),
+        for l in listings
+    ]
+    ids = [f"listing_{l['listing_number']}" for l in listings]
+    metadatas = [_listing_metadata(l) for l in listings]
+
+    # Collect section intros, skipping any with no intro text
+    sections = [s for s in sections if s.get("intro_text", "").strip()]
+    documents += [s["intro_text"] for s in sections]
+    ids += [f"section_{s['section_number']}" for s in sections]
+    metadatas += [
+        {
+            "section_number": s["section_number"],
+            "body_system": s["body_system"],
+            "doc_type": "section_intro",
         }
-        if "subsection" in listing:
-            meta["subsection"] = listing["subsection"]
-            meta["subsection_topic"] = listing.get("subsection_topic", "")
-
-        collection.add(
-            documents=[doc_text],
-            ids=[f"listing_{listing['listing_number']}"],
-            metadatas=[meta],
-        )
-
-        # Progress indicator
-        if (i + 1) % 10 == 0 or i + 1 == len(listings):
-            print(f"  Added {i + 1}/{len(listings)} listings")
-
-    # Add section intros
-    print(f"\nAdding {len(sections)} section intros to database...")
-    for section in sections:
-        if not section.get("intro_text", "").strip():
-            continue
-
-        collection.add(
-            documents=[section["intro_text"]],
-            ids=[f"section_{section['section_number']}"],
-            metadatas=[
-                {
-                    "section_number": section["section_number"],
-                    "body_system": section["body_system"],
-                    "doc_type": "section_intro",
-                }
-            ],
+        for s in sections
+    ]
+
+    # Embed all documents up front in batched forward passes, rather than letting
+    # Chroma call the embedding function separately for every add().
+    # encode() already sorts inputs by length before batching, so each batch is
+    # only padded to the length of its own longest document.
+    print(f"\nComputing embeddings for {len(documents)} documents...")
+    if fp16_model is not None:
+        embeddings = fp16_model.encode(
+            documents,
+            batch_size=ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=True,
         )
+    else:
+        # One encode() call over the whole list with the already-loaded model
+        embeddings = np.asarray(embedding_fn(documents))
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings = embeddings.astype(np.float32)  # Chroma stores float32 vectors
+
+    # Add everything in large batches — one transaction per batch instead of per doc
+    print(
+        f"\nAdding {len(listings)} listings and {len(sections)} section intros "
+        f"to database..."
+    )
+    with tqdm(total=len(documents), desc="Adding documents", unit="doc") as progress:
+        for start in range(0, len(documents), ADD_BATCH_SIZE):
+            end = start + ADD_BATCH_SIZE
+            collection.add(
+                documents=documents[start:end],
+                embeddings=embeddings[start:end],
+                ids=ids[start:end],
+                metadatas=metadatas[start:end],
+            )
+            progress.update(len(ids[start:end]))
 
     # Verify
     total = collection.count()
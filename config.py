@@ -4,6 +4,8 @@ Loads environment variables and defines all shared settings.
 """
 
 import os
+from types import MappingProxyType
+
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,6 +21,15 @@ CHROMA_COLLECTION_NAME = "blue_book"
 
 # --- Embedding Model ---
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+# "torch" (default) or "onnx" — ONNX Runtime with the INT8-quantized model
+# shipped in the model repo; needs `pip install sentence-transformers[onnx]`.
+# Rebuild the database (python build_db.py) after changing this.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+ONNX_MODEL_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+# On-disk query embedding cache (used only if `diskcache` is installed);
+# set EMBEDDING_CACHE_DIR to an empty string to disable it
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join(".cache", "embeddings"))
+EMBEDDING_CACHE_SIZE_LIMIT = 64 * 1024 * 1024  # bytes
 
 # --- RAG Settings ---
 TOP_K = 10  # Number of documents to retrieve per query
@@ -30,7 +41,7 @@ SECTIONS_JSON = os.path.join(DATA_DIR, "blue_book_sections.json")
 RAW_HTML_DIR = os.path.join(DATA_DIR, "raw_html")
 
 # --- Section metadata: maps section number to body system name ---
-SECTION_MAP = {
+SECTION_MAP = MappingProxyType({
     "1.00": "Musculoskeletal",
     "2.00": "Special Senses and Speech",
     "3.00": "Respiratory",
@@ -45,10 +56,10 @@ SECTION_MAP = {
     "12.00": "Mental Disorders",
     "13.00": "Cancer (Neoplastic Diseases)",
     "14.00": "Immune System",
-}
+})
 
 # --- Blue Book URLs (all 14 adult listing sections) ---
-BLUE_BOOK_URLS = [
+BLUE_BOOK_URLS = (
     ("1.00", "https://www.ssa.gov/disability/professionals/bluebook/1.00-Musculoskeletal-Adult.htm"),
     ("2.00", "https://www.ssa.gov/disability/professionals/bluebook/2.00-SpecialSensesandSpeech-Adult.htm"),
     ("3.00", "https://www.ssa.gov/disability/professionals/bluebook/3.00-Respiratory-Adult.htm"),
@@ -63,10 +74,10 @@ BLUE_BOOK_URLS = [
     ("12.00", "https://www.ssa.gov/disability/professionals/bluebook/12.00-MentalDisorders-Adult.htm"),
     ("13.00", "https://www.ssa.gov/disability/professionals/bluebook/13.00-NeoplasticDiseases-Malignant-Adult.htm"),
     ("14.00", "https://www.ssa.gov/disability/professionals/bluebook/14.00-Immune-Adult.htm"),
-]
+)
 
 # --- Section URL map (for source links in analysis results) ---
-SECTION_URL_MAP = {sec_num: url for sec_num, url in BLUE_BOOK_URLS}
+SECTION_URL_MAP = MappingProxyType(dict(BLUE_BOOK_URLS))
 
 # --- CFR Fallback URL ---
 CFR_FALLBACK_URL = "https://www.ssa.gov/OP_Home/cfr20/404/404-app-p01.htm"
@@ -76,19 +87,32 @@ REQUEST_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
 }
 
 
 def get_openrouter_headers() -> dict:
-    """Return headers for OpenRouter API calls."""
-    if not OPENROUTER_API_KEY:
+    """Return headers for OpenRouter API calls.
+
+    The key is read from the environment at call time, so changes made after
+    import (e.g. in tests) are picked up without reloading this module.
+    """
+    api_key = os.environ.get("OPENROUTER_API_KEY", "")
+    if not api_key:
         raise ValueError(
             "OPENROUTER_API_KEY is not set. "
             "Add it to your .env file: OPENROUTER_API_KEY=your_key_here"
         )
     return {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
         "HTTP-Referer": "http://localhost:8000",
         "X-Title": "Blue Book RAG Agent",
     }
+
+
+def get_embedding_model_kwargs() -> dict:
+    """Return extra SentenceTransformer kwargs for the configured backend."""
+    if EMBEDDING_BACKEND == "onnx":
+        return {"backend": "onnx", "model_kwargs": {"file_name": ONNX_MODEL_FILE}}
+    return {}
@@ -3,42 +3,93 @@ Download Blue Book pages using Playwright (headless browser).
 Use this when SSA blocks requests (403 errors).
 
 Usage:
-    python download_pages.py
+    python download_pages.py            # skip pages downloaded in the last week
+    python download_pages.py --force    # re-download every page
 """
 
+import argparse
+import asyncio
 import os
 import time
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 
 from config import BLUE_BOOK_URLS, RAW_HTML_DIR
 
-def main():
-    os.makedirs(RAW_HTML_DIR, exist_ok=True)
+# Max pages loading at the same time (be polite to SSA servers)
+MAX_CONCURRENT_PAGES = 4
 
-    print("Downloading Blue Book pages with headless browser...")
-    print("=" * 60)
+# Saved pages smaller than this are treated as failed/blocked downloads
+MIN_CACHED_SIZE = 10_000
+# Saved pages older than this are downloaded again
+CACHE_MAX_AGE_SECONDS = 7 * 86400
+
+
+def is_cached(filepath: str) -> bool:
+    """Return True if a recent, non-trivial copy of the page is already saved."""
+    if not os.path.exists(filepath):
+        return False
+    if os.path.getsize(filepath) <= MIN_CACHED_SIZE:
+        return False
+    return time.time() - os.path.getmtime(filepath) < CACHE_MAX_AGE_SECONDS
+
+
+async def fetch_section(context, semaphore, section_number: str, url: str, force: bool):
+    """Load one section page in its own tab and save the rendered HTML."""
+    filename = f"section_{section_number}.html"
+    filepath = os.path.join(RAW_HTML_DIR, filename)
+
+    if not force and is_cached(filepath):
+        print(f"[{section_number}] Cached, skipping: {filepath}")
+        return
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    async with semaphore:
+        print(f"[{section_number}] Fetching: {url}")
+        page = await context.new_page()
+        try:
+            response = await page.goto(url, wait_until="networkidle", timeout=30000)
+            if response is not None and response.ok:
+                # Raw document bytes as served — no decode/re-encode round trip
+                body = await response.body()
+            else:
+                body = (await page.content()).encode("utf-8")
+            with open(filepath, "wb") as f:
+                f.write(body)
+            print(f"  [{section_number}] Saved: {filepath} ({len(body):,} bytes)")
+        except Exception as e:
+            print(f"  [{section_number}] ERROR: {e}")
+        finally:
+            await page.close()
 
-        for section_number, url in BLUE_BOOK_URLS:
-            filename = f"section_{section_number}.html"
-            filepath = os.path.join(RAW_HTML_DIR, filename)
 
-            print(f"\n[{section_number}] Fetching: {url}")
-            try:
-                page.goto(url, wait_until="networkidle", timeout=30000)
-                html = page.content()
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(html)
-                print(f"  Saved: {filepath} ({len(html):,} bytes)")
-            except Exception as e:
-                print(f"  ERROR: {e}")
+async def download_all(force: bool = False):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
 
-            time.sleep(2)
+        await asyncio.gather(
+            *(
+                fetch_section(context, semaphore, section_number, url, force)
+                for section_number, url in BLUE_BOOK_URLS
+            )
+        )
+
+        await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--force", action="store_true", help="re-download pages even if cached"
+    )
+    args = parser.parse_args()
+
+    os.makedirs(RAW_HTML_DIR, exist_ok=True)
+
+    print("Downloading Blue Book pages with headless browser...")
+    print("=" * 60)
 
-        browser.close()
+    asyncio.run(download_all(force=args.force))
 
     print(f"\n{'='*60}")
     print("Done! Now run: python scraper.py")
@@ -10,32 +10,105 @@ Usage:
 """
 
 import asyncio
-import json
+import hashlib
 import os
-
+import re
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
+
+import orjson
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
 from config import LISTINGS_JSON
 from rag import analyze_medical_findings
 
-app = FastAPI(title="Blue Book RAG Agent", version="1.0.0")
-
 # --- Cache listings in memory at startup ---
-_listings_cache: list[dict] | None = None
 
 
+@lru_cache(maxsize=1)
 def _load_listings() -> list[dict]:
-    """Load listings from JSON file, with caching."""
-    global _listings_cache
-    if _listings_cache is None:
-        if not os.path.exists(LISTINGS_JSON):
-            return []
-        with open(LISTINGS_JSON, "r", encoding="utf-8") as f:
-            _listings_cache = json.load(f)
-    return _listings_cache
+    """Load listings from JSON file, with caching.
+
+    Raises FileNotFoundError until the scraper has written the file; lru_cache
+    doesn't cache exceptions, so the listings are picked up without a restart.
+    """
+    with open(LISTINGS_JSON, "rb") as f:
+        return orjson.loads(f.read())
+
+
+@lru_cache(maxsize=1)
+def _listing_index() -> dict[str, dict]:
+    """Map listing_number -> listing, for O(1) lookups."""
+    return {l["listing_number"]: l for l in _load_listings()}
+
+
+@lru_cache(maxsize=1)
+def _listings_summary_bytes() -> bytes:
+    """Serialized /listings response body (number, title, body system)."""
+    return orjson.dumps(
+        [
+            {
+                "listing_number": l["listing_number"],
+                "title": l["title"],
+                "body_system": l["body_system"],
+            }
+            for l in _load_listings()
+        ]
+    )
+
+
+# --- Bounded worker pool for the blocking RAG pipeline ---
+ANALYZE_MAX_WORKERS = max(4, os.cpu_count() or 1)
+_analyze_executor: ThreadPoolExecutor | None = None
+
+
+def _get_analyze_executor() -> ThreadPoolExecutor:
+    """Get the shared analysis thread pool, creating it on first use."""
+    global _analyze_executor
+    if _analyze_executor is None:
+        _analyze_executor = ThreadPoolExecutor(
+            max_workers=ANALYZE_MAX_WORKERS, thread_name_prefix="analyze"
+        )
+    return _analyze_executor
+
+
+# --- LRU cache of /analyze results, keyed by normalized findings text ---
+ANALYZE_CACHE_MAX = 512
+_analyze_cache: OrderedDict[str, dict] = OrderedDict()
+
+
+def _analyze_cache_key(medical_findings: str) -> str:
+    """Hash the findings text, ignoring case and whitespace differences."""
+    normalized = " ".join(medical_findings.lower().split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the listings and index.html caches before the first request."""
+    with suppress(FileNotFoundError):
+        _load_listings()
+        _listing_index()
+        _listings_summary_bytes()
+    _index_html_bytes()
+    yield
+
+    global _analyze_executor
+    if _analyze_executor is not None:
+        _analyze_executor.shutdown(wait=True)
+        _analyze_executor = None
+
+
+app = FastAPI(title="Blue Book RAG Agent", version="1.0.0", lifespan=lifespan)
+# Compress larger responses (/listings, /analyze, static assets)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 
 # --- Request/Response Models ---
@@ -56,13 +129,62 @@ class AnalyzeResponse(BaseModel):
     error: str | None = None
 
 
+# --- Static Files ---
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache versioned assets for a year.
+
+    Requests carrying a ?v= query string (as rendered by _index_html_bytes) are
+    immutable; anything else is revalidated against the ETag on every use.
+    """
+
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            if scope.get("query_string", b"").startswith(b"v="):
+                response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+            else:
+                response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+# Asset references in index.html, e.g. /static/style.css?v=...
+_ASSET_REF_RE = re.compile(r"(/static/([\w.-]+))\?v=[\w.-]*")
+
+
+def _asset_version(name: str) -> str:
+    """Short content hash of a static asset, used as its cache-busting version."""
+    with open(os.path.join("static", name), "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=6).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _index_html_bytes() -> bytes:
+    """index.html with each asset's ?v= set to its content hash.
+
+    Static files don't change while the server runs, so this is rendered once.
+    """
+    with open(os.path.join("static", "index.html"), encoding="utf-8") as f:
+        html = f.read()
+    html = _ASSET_REF_RE.sub(lambda m: f"{m.group(1)}?v={_asset_version(m.group(2))}", html)
+    return html.encode("utf-8")
+
+
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
+
+
 # --- API Endpoints ---
 
 
 @app.get("/")
 async def serve_frontend():
     """Serve the main frontend page."""
-    return FileResponse("static/index.html")
+    return Response(
+        _index_html_bytes(),
+        media_type="text/html",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @app.post("/analyze", response_model=AnalyzeResponse)
@@ -80,10 +202,17 @@ async def analyze(request: AnalyzeRequest):
             detail="Please provide more detailed medical findings (at least a few sentences).",
         )
 
+    cache_key = _analyze_cache_key(request.medical_findings)
+    cached = _analyze_cache.get(cache_key)
+    if cached is not None:
+        _analyze_cache.move_to_end(cache_key)
+        return AnalyzeResponse(**cached)
+
     try:
-        # Run the sync RAG pipeline in a thread to avoid blocking FastAPI
-        result = await asyncio.to_thread(
-            analyze_medical_findings, request.medical_findings
+        # Run the sync RAG pipeline on the shared pool to avoid blocking FastAPI
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            _get_analyze_executor(), analyze_medical_findings, request.medical_findings
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -94,31 +223,34 @@ async def analyze(request: AnalyzeRequest):
             detail=result.get("error", "An unknown error occurred."),
         )
 
+    _analyze_cache[cache_key] = result
+    _analyze_cache.move_to_end(cache_key)
+    while len(_analyze_cache) > ANALYZE_CACHE_MAX:
+        _analyze_cache.popitem(last=False)
+
     return AnalyzeResponse(**result)
 
 
 @app.get("/listings")
 async def get_listings():
     """Return all Blue Book listings (number, title, body system) for reference."""
-    listings = _load_listings()
-    return [
-        {
-            "listing_number": l["listing_number"],
-            "title": l["title"],
-            "body_system": l["body_system"],
-        }
-        for l in listings
-    ]
+    try:
+        content = _listings_summary_bytes()
+    except FileNotFoundError:
+        content = b"[]"
+    return Response(content=content, media_type="application/json")
 
 
 @app.get("/listings/{listing_number}")
 async def get_listing(listing_number: str):
     """Return the full text of a specific Blue Book listing."""
-    listings = _load_listings()
-    for l in listings:
-        if l["listing_number"] == listing_number:
-            return l
-    raise HTTPException(status_code=404, detail=f"Listing {listing_number} not found.")
+    try:
+        listing = _listing_index().get(listing_number)
+    except FileNotFoundError:
+        listing = None
+    if listing is None:
+        raise HTTPException(status_code=404, detail=f"Listing {listing_number} not found.")
+    return listing
 
 
 @app.get("/health")
@@ -127,12 +259,21 @@ async def health():
     return {"status": "healthy", "version": "1.0.0"}
 
 
-# Mount static files AFTER route definitions
-app.mount("/static", StaticFiles(directory="static"), name="static")
-
 if __name__ == "__main__":
     import uvicorn
 
     port = int(os.environ.get("PORT", 8000))
+    # Each worker loads its own embedding model; set WEB_CONCURRENCY=1 on
+    # memory-constrained hosts
+    workers = int(os.environ.get("WEB_CONCURRENCY", max(2, (os.cpu_count() or 1) // 2)))
     # Set reload to False for production to save memory
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=False)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        reload=False,
+        workers=workers,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        access_log=False,
+    )
@@ -7,19 +7,36 @@ constructs a prompt, and calls Claude via OpenRouter for analysis.
 No LangChain — built manually for simplicity.
 """
 
+import hashlib
 import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Callable
 
 import chromadb
+import orjson
 import requests
 from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
 from config import (
     CHROMA_COLLECTION_NAME,
     CHROMA_DB_PATH,
     CLAUDE_MODEL,
+    EMBEDDING_BACKEND,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_SIZE_LIMIT,
     EMBEDDING_MODEL,
     OPENROUTER_BASE_URL,
     TOP_K,
+    get_embedding_model_kwargs,
     get_openrouter_headers,
 )
 
@@ -135,22 +152,102 @@ Do NOT hallucinate criteria. Only reference criteria that appear in the Blue Boo
 _embedding_fn = None
 _chroma_client = None
 _collection = None
+_collection_lock = threading.Lock()
 
 def get_chroma_collection():
     """Get the ChromaDB collection using a singleton pattern to save memory."""
     global _embedding_fn, _chroma_client, _collection
-    
+
     if _collection is None:
-        # Initialize only once per process
-        _embedding_fn = SentenceTransformerEmbeddingFunction(model_name=EMBEDDING_MODEL)
-        _chroma_client = chromadb.PersistentClient(path=CHROMA_DB_PATH)
-        _collection = _chroma_client.get_collection(
-            name=CHROMA_COLLECTION_NAME,
-            embedding_function=_embedding_fn,
-        )
+        # Requests run on a thread pool — make sure only one thread loads the model
+        with _collection_lock:
+            if _collection is None:
+                # Initialize only once per process
+                _embedding_fn = SentenceTransformerEmbeddingFunction(
+                    model_name=EMBEDDING_MODEL, **get_embedding_model_kwargs()
+                )
+                _chroma_client = chromadb.PersistentClient(path=CHROMA_DB_PATH)
+                _collection = _chroma_client.get_collection(
+                    name=CHROMA_COLLECTION_NAME,
+                    embedding_function=_embedding_fn,
+                )
     return _collection
 
 
+# LRU cache of query embeddings, keyed by query text. The condition sub-queries
+# are fixed strings, so they are embedded once per process; repeated or retried
+# findings skip the forward pass entirely.
+QUERY_EMBEDDING_CACHE_SIZE = 512
+_query_embedding_cache: OrderedDict[str, list[float]] = OrderedDict()
+_query_embedding_lock = threading.Lock()
+
+
+# Optional second tier: an on-disk LRU (diskcache) shared by all worker
+# processes and kept across restarts. Disabled if diskcache isn't installed
+# or EMBEDDING_CACHE_DIR is empty.
+_disk_embedding_cache = None
+
+
+def _get_disk_embedding_cache():
+    """Get the on-disk query embedding cache, or None if it's disabled."""
+    global _disk_embedding_cache
+    if diskcache is None or not EMBEDDING_CACHE_DIR:
+        return None
+    if _disk_embedding_cache is None:
+        with _query_embedding_lock:
+            if _disk_embedding_cache is None:
+                _disk_embedding_cache = diskcache.Cache(
+                    EMBEDDING_CACHE_DIR,
+                    size_limit=EMBEDDING_CACHE_SIZE_LIMIT,
+                    eviction_policy="least-recently-used",
+                )
+    return _disk_embedding_cache
+
+
+def _disk_embedding_key(text: str) -> bytes:
+    """Key on model + backend too, so switching either never reuses stale vectors."""
+    raw = f"{EMBEDDING_MODEL}\0{EMBEDDING_BACKEND}\0{text}".encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _embed_queries(texts: list[str]) -> list[list[float]]:
+    """Embed query texts, computing only cache misses (in one batch)."""
+    get_chroma_collection()  # ensures _embedding_fn is loaded
+
+    with _query_embedding_lock:
+        found = {}
+        for text in texts:
+            if text in _query_embedding_cache:
+                _query_embedding_cache.move_to_end(text)
+                found[text] = _query_embedding_cache[text]
+
+    missing = [t for t in dict.fromkeys(texts) if t not in found]
+    if missing:
+        disk = _get_disk_embedding_cache()
+        to_embed = missing
+        if disk is not None:
+            for text in missing:
+                vector = disk.get(_disk_embedding_key(text))
+                if vector is not None:
+                    found[text] = vector
+            to_embed = [t for t in missing if t not in found]
+
+        if to_embed:
+            embedded = _embedding_fn(to_embed)
+            found.update(zip(to_embed, embedded))
+            if disk is not None:
+                for text, vector in zip(to_embed, embedded):
+                    disk.set(_disk_embedding_key(text), vector)
+
+        with _query_embedding_lock:
+            for text in missing:
+                _query_embedding_cache[text] = found[text]
+            while len(_query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                _query_embedding_cache.popitem(last=False)
+
+    return [found[t] for t in texts]
+
+
 def search_blue_book(query: str, top_k: int = TOP_K) -> list[dict]:
     """
     Multi-query search: extract medical conditions from the input,
@@ -172,50 +269,49 @@ def search_blue_book(query: str, top_k: int = TOP_K) -> list[dict]:
     # Always include the full query as the primary search
     all_queries = [query] + sub_queries
 
-    # Phase 1: Run all queries and collect results
+    # Phase 1: Run all queries in one batched call and collect results
     # Each doc tracks the best (lowest) rank it achieved across all queries
     doc_map = {}  # doc_id -> doc dict
 
-    for q in all_queries:
-        results = collection.query(
-            query_texts=[q],
-            n_results=top_k,
-            include=["documents", "metadatas", "distances"],
-        )
-
-        for i in range(len(results["ids"][0])):
-            doc_id = results["ids"][0][i]
-            dist = results["distances"][0][i]
+    results = collection.query(
+        query_embeddings=_embed_queries(all_queries),
+        n_results=top_k,
+        include=["documents", "metadatas", "distances"],
+    )
 
-            if doc_id not in doc_map:
+    for q_ids, q_texts, q_metas, q_dists in zip(
+        results["ids"], results["documents"], results["metadatas"], results["distances"]
+    ):
+        for rank, (doc_id, dist) in enumerate(zip(q_ids, q_dists)):
+            doc = doc_map.get(doc_id)
+            if doc is None:
                 doc_map[doc_id] = {
                     "id": doc_id,
-                    "text": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i],
+                    "text": q_texts[rank],
+                    "metadata": q_metas[rank],
                     "distance": dist,
-                    "best_rank": i,  # best rank across all queries
+                    "best_rank": rank,  # best rank across all queries
                 }
             else:
                 # Keep the best (lowest) distance and rank
-                if dist < doc_map[doc_id]["distance"]:
-                    doc_map[doc_id]["distance"] = dist
-                if i < doc_map[doc_id]["best_rank"]:
-                    doc_map[doc_id]["best_rank"] = i
+                if dist < doc["distance"]:
+                    doc["distance"] = dist
+                if rank < doc["best_rank"]:
+                    doc["best_rank"] = rank
 
-    # Phase 1b: Split into guaranteed (top-ranked in ANY query) vs overflow
+    # Phase 2: Filter out irrelevant results (distance too high = poor match),
+    # then split survivors into guaranteed (top-ranked in ANY query) vs overflow
+    MAX_DISTANCE = 0.6  # cosine distance threshold; above this is noise
     guaranteed_docs = []
     overflow_docs = []
     for doc in doc_map.values():
+        if doc["distance"] > MAX_DISTANCE:
+            continue
         if doc["best_rank"] < GUARANTEED_PER_QUERY:
             guaranteed_docs.append(doc)
         else:
             overflow_docs.append(doc)
 
-    # Phase 2: Filter out irrelevant results (distance too high = poor match)
-    MAX_DISTANCE = 0.6  # cosine distance threshold; above this is noise
-    guaranteed_docs = [d for d in guaranteed_docs if d["distance"] <= MAX_DISTANCE]
-    overflow_docs = [d for d in overflow_docs if d["distance"] <= MAX_DISTANCE]
-
     # Phase 3: Merge — guaranteed docs + best overflow docs by distance
     overflow_docs.sort(key=lambda d: d["distance"])
 
@@ -229,6 +325,71 @@ def search_blue_book(query: str, top_k: int = TOP_K) -> list[dict]:
     return final_docs
 
 
+# Map keywords in the medical text to focused Blue Book search queries
+CONDITION_MAP = [
+    # Vision
+    (["visual acuity", "vision loss", "visual field", "retinopathy", "macular",
+      "blindness", "optic", "glaucoma", "cataract"],
+     "loss of central visual acuity visual field contraction visual efficiency impairment"),
+    # Hearing
+    (["hearing loss", "deaf", "audiometric", "cochlear", "tinnitus"],
+     "hearing loss audiometric cochlear implant speech recognition"),
+    # Musculoskeletal / Spine
+    (["back pain", "spine", "disc", "herniation", "stenosis", "lumbar",
+      "cervical", "nerve root", "radiculopathy"],
+     "disorders of the spine nerve root compression lumbar cervical"),
+    # Neuropathy
+    (["neuropathy", "peripheral neuropathy", "decreased sensation", "numbness",
+      "tingling", "nerve damage"],
+     "peripheral neuropathy disorganization of motor function sensory disturbance"),
+    # Diabetes / Endocrine
+    (["diabetes", "diabetic", "a1c", "insulin", "endocrine", "thyroid"],
+     "endocrine disorders diabetes complications multiple body systems"),
+    # Kidney / Renal
+    (["ckd", "kidney", "renal", "egfr", "dialysis", "transplant", "creatinine"],
+     "chronic kidney disease renal impairment genitourinary"),
+    # Cardiovascular
+    (["heart", "cardiac", "coronary", "hypertension", "heart failure", "arrhythmia"],
+     "chronic heart failure ischemic heart disease cardiovascular"),
+    # Respiratory
+    (["copd", "asthma", "pulmonary", "lung", "breathing", "oxygen", "fev1"],
+     "chronic pulmonary insufficiency asthma respiratory disorders"),
+    # Mental disorders
+    (["depression", "anxiety", "ptsd", "bipolar", "schizophrenia", "mental",
+      "psychiatric", "psychological"],
+     "depressive disorders anxiety disorders mental disorders cognitive limitations"),
+    # Neurological
+    (["seizure", "epilepsy", "stroke", "multiple sclerosis", "parkinsons",
+      "cerebral", "brain injury"],
+     "epilepsy cerebral palsy central nervous system vascular accident neurological"),
+    # Cancer
+    (["cancer", "tumor", "malignant", "chemotherapy", "radiation", "oncology",
+      "carcinoma", "lymphoma", "leukemia"],
+     "neoplastic diseases malignant cancer treatment effects"),
+    # Immune
+    (["hiv", "lupus", "autoimmune", "immune", "rheumatoid", "inflammatory bowel"],
+     "immune system disorders systemic lupus inflammatory arthritis"),
+    # Skin
+    (["dermatitis", "skin lesions", "burns", "psoriasis", "skin disorder"],
+     "skin disorders dermatitis burns ichthyosis"),
+]
+
+# Keyword -> index of its condition group in CONDITION_MAP
+_KEYWORD_GROUP = {
+    kw: group for group, (keywords, _) in enumerate(CONDITION_MAP) for kw in keywords
+}
+
+# All keywords in one pattern, so the text is scanned once regardless of how
+# many keywords there are. The lookahead makes matches zero-width, so a keyword
+# starting inside another match is still found; longest keywords go first.
+# Word boundaries avoid false positives (e.g., "disc" matching "discrimination").
+_KEYWORD_PATTERN = re.compile(
+    r"(?=\b("
+    + "|".join(re.escape(kw) for kw in sorted(_KEYWORD_GROUP, key=len, reverse=True))
+    + r")\b)"
+)
+
+
 def _extract_condition_queries(medical_text: str) -> list[str]:
     """
     Extract condition-specific search queries from medical findings.
@@ -240,64 +401,26 @@ def _extract_condition_queries(medical_text: str) -> list[str]:
     combined query would miss.
     """
     text_lower = medical_text.lower()
-    sub_queries = []
-
-    # Map keywords in the medical text to focused Blue Book search queries
-    condition_map = [
-        # Vision
-        (["visual acuity", "vision loss", "visual field", "retinopathy", "macular",
-          "blindness", "optic", "glaucoma", "cataract"],
-         "loss of central visual acuity visual field contraction visual efficiency impairment"),
-        # Hearing
-        (["hearing loss", "deaf", "audiometric", "cochlear", "tinnitus"],
-         "hearing loss audiometric cochlear implant speech recognition"),
-        # Musculoskeletal / Spine
-        (["back pain", "spine", "disc", "herniation", "stenosis", "lumbar",
-          "cervical", "nerve root", "radiculopathy"],
-         "disorders of the spine nerve root compression lumbar cervical"),
-        # Neuropathy
-        (["neuropathy", "peripheral neuropathy", "decreased sensation", "numbness",
-          "tingling", "nerve damage"],
-         "peripheral neuropathy disorganization of motor function sensory disturbance"),
-        # Diabetes / Endocrine
-        (["diabetes", "diabetic", "a1c", "insulin", "endocrine", "thyroid"],
-         "endocrine disorders diabetes complications multiple body systems"),
-        # Kidney / Renal
-        (["ckd", "kidney", "renal", "egfr", "dialysis", "transplant", "creatinine"],
-         "chronic kidney disease renal impairment genitourinary"),
-        # Cardiovascular
-        (["heart", "cardiac", "coronary", "hypertension", "heart failure", "arrhythmia"],
-         "chronic heart failure ischemic heart disease cardiovascular"),
-        # Respiratory
-        (["copd", "asthma", "pulmonary", "lung", "breathing", "oxygen", "fev1"],
-         "chronic pulmonary insufficiency asthma respiratory disorders"),
-        # Mental disorders
-        (["depression", "anxiety", "ptsd", "bipolar", "schizophrenia", "mental",
-          "psychiatric", "psychological"],
-         "depressive disorders anxiety disorders mental disorders cognitive limitations"),
-        # Neurological
-        (["seizure", "epilepsy", "stroke", "multiple sclerosis", "parkinsons",
-          "cerebral", "brain injury"],
-         "epilepsy cerebral palsy central nervous system vascular accident neurological"),
-        # Cancer
-        (["cancer", "tumor", "malignant", "chemotherapy", "radiation", "oncology",
-          "carcinoma", "lymphoma", "leukemia"],
-         "neoplastic diseases malignant cancer treatment effects"),
-        # Immune
-        (["hiv", "lupus", "autoimmune", "immune", "rheumatoid", "inflammatory bowel"],
-         "immune system disorders systemic lupus inflammatory arthritis"),
-        # Skin
-        (["dermatitis", "skin lesions", "burns", "psoriasis", "skin disorder"],
-         "skin disorders dermatitis burns ichthyosis"),
-    ]
+    matched_groups = {
+        _KEYWORD_GROUP[m.group(1)] for m in _KEYWORD_PATTERN.finditer(text_lower)
+    }
+    return [CONDITION_MAP[group][1] for group in sorted(matched_groups)]
+
 
-    for keywords, search_query in condition_map:
-        # Use word boundaries to avoid false positives (e.g., "disc" matching "discrimination")
-        patterns = [rf"\b{re.escape(kw)}\b" for kw in keywords]
-        if any(re.search(pattern, text_lower) for pattern in patterns):
-            sub_queries.append(search_query)
+# Section 2.00 subsection topic -> listings that make it relevant
+SUBSECTION_TOPIC_LISTINGS = {
+    "visual_disorders": frozenset({"2.02", "2.03", "2.04"}),
+    "hearing_loss": frozenset({"2.10", "2.11"}),
+    "vestibular": frozenset({"2.07"}),
+    "speech": frozenset({"2.09"}),
+}
+ALL_SUBSECTION_TOPICS = frozenset(SUBSECTION_TOPIC_LISTINGS) | {"general"}
 
-    return sub_queries
+
+# Separators and markers used in the user message
+_RULE_WIDE = "-" * 60
+_RULE_NARROW = "-" * 40
+_TRUNCATION_MARKER = "[... truncated for brevity ...]"
 
 
 def build_claude_prompt(
@@ -309,41 +432,36 @@ def build_claude_prompt(
     Separates retrieved docs into listings and section intros,
     then builds a structured user message.
     """
-    # Separate listings from section intros, and filter out irrelevant subsections
+    # Separate listings from section intros in one pass, collecting the
+    # listing numbers needed to filter Section 2.00 subsections
     listings = []
     section_intros = []
     subsection_docs = []  # Section 2.00 subsections stored as listings
+    listing_nums = set()
     for doc in retrieved_docs:
-        if doc["metadata"].get("doc_type") == "section_intro":
+        meta = doc["metadata"]
+        if meta.get("doc_type") == "section_intro":
             section_intros.append(doc)
-        elif doc["metadata"].get("subsection_topic"):
+        elif meta.get("subsection_topic"):
             # This is a Section 2.00 subsection — treat as evaluation guideline
             subsection_docs.append(doc)
         else:
             listings.append(doc)
+            listing_nums.add(meta.get("listing_number", ""))
 
     # Filter Section 2.00 subsections: only include those relevant to retrieved listings
     # e.g., if we have vision listings (2.02-2.04), only include visual_disorders subsection
     if subsection_docs:
-        listing_nums = {doc["metadata"].get("listing_number", "") for doc in listings}
-        has_vision = any(n in listing_nums for n in ("2.02", "2.03", "2.04"))
-        has_hearing = any(n in listing_nums for n in ("2.10", "2.11"))
-        has_vestibular = "2.07" in listing_nums
-        has_speech = "2.09" in listing_nums
-
-        relevant_topics = {"general"}  # always include general guidelines
-        if has_vision:
-            relevant_topics.add("visual_disorders")
-        if has_hearing:
-            relevant_topics.add("hearing_loss")
-        if has_vestibular:
-            relevant_topics.add("vestibular")
-        if has_speech:
-            relevant_topics.add("speech")
-
-        # If no specific 2.xx listings found, include all subsections
-        if not (has_vision or has_hearing or has_vestibular or has_speech):
-            relevant_topics = {"visual_disorders", "hearing_loss", "vestibular", "speech", "general"}
+        relevant_topics = {
+            topic
+            for topic, topic_listings in SUBSECTION_TOPIC_LISTINGS.items()
+            if listing_nums & topic_listings
+        }
+        if relevant_topics:
+            relevant_topics.add("general")  # always include general guidelines
+        else:
+            # If no specific 2.xx listings found, include all subsections
+            relevant_topics = ALL_SUBSECTION_TOPICS
 
         for doc in subsection_docs:
             topic = doc["metadata"].get("subsection_topic", "")
@@ -355,7 +473,7 @@ def build_claude_prompt(
 
     if listings:
         user_parts.append("BLUE BOOK LISTINGS (retrieved from database):")
-        user_parts.append("-" * 60)
+        user_parts.append(_RULE_WIDE)
         for doc in listings:
             meta = doc["metadata"]
             source_url = meta.get("source_url", "")
@@ -366,12 +484,12 @@ def build_claude_prompt(
             if source_url:
                 user_parts.append(f"Source: {source_url}")
             user_parts.append(doc["text"])
-            user_parts.append("-" * 40)
+            user_parts.append(_RULE_NARROW)
         user_parts.append("")
 
     if section_intros:
         user_parts.append("EVALUATION GUIDELINES (from relevant body system sections):")
-        user_parts.append("-" * 60)
+        user_parts.append(_RULE_WIDE)
         for doc in section_intros:
             meta = doc["metadata"]
             subsection_topic = meta.get("subsection_topic", "")
@@ -388,15 +506,18 @@ def build_claude_prompt(
             else:
                 max_len = 3000
             if len(intro_text) > max_len:
-                intro_text = intro_text[:max_len] + "\n[... truncated for brevity ...]"
-            user_parts.append(intro_text)
-            user_parts.append("-" * 40)
+                # Separate parts — the join supplies the newline before the marker
+                user_parts.append(intro_text[:max_len])
+                user_parts.append(_TRUNCATION_MARKER)
+            else:
+                user_parts.append(intro_text)
+            user_parts.append(_RULE_NARROW)
         user_parts.append("")
 
     user_parts.append("CLIENT'S MEDICAL FINDINGS:")
-    user_parts.append("-" * 60)
+    user_parts.append(_RULE_WIDE)
     user_parts.append(medical_findings)
-    user_parts.append("-" * 60)
+    user_parts.append(_RULE_WIDE)
     user_parts.append("")
     user_parts.append(
         "Please analyze these medical findings against the Blue Book listings above."
@@ -408,24 +529,62 @@ def build_claude_prompt(
     ]
 
 
-def call_claude(messages: list[dict]) -> str:
+# Seconds to wait for OpenRouter to respond
+OPENROUTER_TIMEOUT = 120
+
+# Shared HTTP session for OpenRouter — keeps connections alive between calls
+# and retries failed connections and transient 5xx errors before surfacing
+# them to the user. Read errors are never retried: the request may already
+# have been processed (and billed), and read=False lets a read timeout
+# surface as requests.ReadTimeout rather than a generic ConnectionError.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            read=False,
+            status=2,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=None,  # include POST for connect/5xx retries
+            raise_on_status=False,  # return the last response; handled below
+        ),
+    ),
+)
+
+
+def call_claude(
+    messages: list[dict], on_delta: Callable[[str], None] | None = None
+) -> str:
     """
     Call Claude via OpenRouter API.
 
+    If on_delta is given, the response is streamed and each text fragment is
+    passed to on_delta as it arrives.
+
     Returns the assistant's response text.
     Raises an exception with a user-friendly message on failure.
     """
+    stream = on_delta is not None
+    payload = {
+        "model": CLAUDE_MODEL,
+        "messages": messages,
+        "max_tokens": 8192,
+        "temperature": 0.2,
+    }
+    if stream:
+        payload["stream"] = True
+
     try:
-        response = requests.post(
+        response = _SESSION.post(
             OPENROUTER_BASE_URL,
             headers=get_openrouter_headers(),
-            json={
-                "model": CLAUDE_MODEL,
-                "messages": messages,
-                "max_tokens": 8192,
-                "temperature": 0.2,
-            },
-            timeout=120,
+            json=payload,
+            timeout=OPENROUTER_TIMEOUT,
+            stream=stream,
         )
     except requests.Timeout:
         raise Exception(
@@ -438,27 +597,33 @@ def call_claude(messages: list[dict]) -> str:
             "Please check your internet connection."
         )
 
-    if response.status_code == 401:
-        raise Exception(
-            "Invalid OpenRouter API key. "
-            "Check your .env file and make sure OPENROUTER_API_KEY is correct."
-        )
-    elif response.status_code == 429:
-        raise Exception(
-            "Rate limit exceeded on OpenRouter. "
-            "Please wait a moment and try again."
-        )
-    elif response.status_code >= 500:
-        raise Exception(
-            f"OpenRouter server error ({response.status_code}). "
-            "Please try again in a moment."
-        )
-    elif response.status_code != 200:
-        raise Exception(
-            f"OpenRouter API error ({response.status_code}): {response.text[:200]}"
-        )
+    # Close the response on every path — a streamed body otherwise holds its
+    # pooled connection until garbage collection
+    with response:
+        if response.status_code == 401:
+            raise Exception(
+                "Invalid OpenRouter API key. "
+                "Check your .env file and make sure OPENROUTER_API_KEY is correct."
+            )
+        elif response.status_code == 429:
+            raise Exception(
+                "Rate limit exceeded on OpenRouter. "
+                "Please wait a moment and try again."
+            )
+        elif response.status_code >= 500:
+            raise Exception(
+                f"OpenRouter server error ({response.status_code}). "
+                "Please try again in a moment."
+            )
+        elif response.status_code != 200:
+            raise Exception(
+                f"OpenRouter API error ({response.status_code}): {response.text[:200]}"
+            )
 
-    data = response.json()
+        if stream:
+            return _read_claude_stream(response, on_delta)
+
+        data = orjson.loads(response.content)
 
     # Extract the response text
     try:
@@ -469,6 +634,60 @@ def call_claude(messages: list[dict]) -> str:
         )
 
 
+def _read_claude_stream(response, on_delta: Callable[[str], None]) -> str:
+    """Accumulate an OpenRouter server-sent-events stream into the full text."""
+    response.encoding = "utf-8"
+    parts = []
+    for line in response.iter_lines(decode_unicode=True):
+        # Skip blank keep-alives and ": OPENROUTER PROCESSING" comments
+        if not line or not line.startswith("data: "):
+            continue
+        data = line[len("data: "):]
+        if data == "[DONE]":
+            break
+
+        chunk = orjson.loads(data)
+        if "error" in chunk:
+            raise Exception(f"OpenRouter stream error: {str(chunk['error'])[:200]}")
+        try:
+            delta = chunk["choices"][0]["delta"].get("content")
+        except (KeyError, IndexError):
+            continue
+        if delta:
+            parts.append(delta)
+            on_delta(delta)
+
+    if not parts:
+        raise Exception("OpenRouter returned an empty streamed response.")
+    return "".join(parts)
+
+
+# Age in the findings: "Age 55", "Aged 55", "55-year-old", "55 year old"
+_AGE_RE = re.compile(r"(?:age|aged?)\s*[:\s]*(\d{2})|(\d{2})\s*(?=-year-old|year\s*old)")
+
+# Listing numbers mentioned in Claude's analysis, e.g. "Listing 2.04" or "1.15".
+# Only body-system prefixes 1-14 count, so values like "20.50" or "112.04 mg"
+# in the analysis aren't reported as listings.
+_LISTING_RE = re.compile(r"(?<![\d.])((?:1[0-4]|[1-9])\.\d{2})(?!\d)")
+
+VISION_KEYWORDS = ("visual acuity", "snellen", "retinopathy", "visual field",
+                   "vision loss", "macular", "optic")
+HEARING_CONTAMINANTS = ("audiologist", "audiometric", "otoscopic",
+                        "hearing evaluation", "cochlear", "audiological")
+
+# Lowercase section keyword -> label used in the "Missing section" warning
+REQUIRED_SECTIONS = {
+    "potentially matching listings": "Listing identification section",
+    "criteria analysis": "Criteria analysis section",
+    "evidence gaps": "Evidence gaps section",
+    "strength assessment": "Strength assessment section",
+    "strategic pathway ranking": "Strategic pathway ranking",
+    "rfc": "RFC considerations section",
+    "strengths and weaknesses": "Case strengths and weaknesses",
+    "sources": "Sources section with Blue Book links",
+}
+
+
 def _validate_analysis(analysis: str, medical_findings: str) -> list[str]:
     """
     Post-analysis validation layer.
@@ -477,93 +696,86 @@ def _validate_analysis(analysis: str, medical_findings: str) -> list[str]:
     Returns a list of warning strings (empty if all checks pass).
     """
     warnings = []
-    analysis_upper = analysis.upper()
+    # Lowercase once and reuse for every check below
+    analysis_lower = analysis.lower()
 
     # --- Required Section Checks ---
-    required_sections = {
-        "POTENTIALLY MATCHING LISTINGS": "Listing identification section",
-        "CRITERIA ANALYSIS": "Criteria analysis section",
-        "EVIDENCE GAPS": "Evidence gaps section",
-        "STRENGTH ASSESSMENT": "Strength assessment section",
-        "STRATEGIC PATHWAY RANKING": "Strategic pathway ranking",
-        "RFC": "RFC considerations section",
-        "STRENGTHS AND WEAKNESSES": "Case strengths and weaknesses",
-        "SOURCES": "Sources section with Blue Book links",
-    }
-    for keyword, label in required_sections.items():
-        if keyword not in analysis_upper:
+    for keyword, label in REQUIRED_SECTIONS.items():
+        if keyword not in analysis_lower:
             warnings.append(f"Missing section: {label}")
 
     # --- Age Classification Check ---
     findings_lower = medical_findings.lower()
-    # Support "Age 55", "Aged 55", "55-year-old", "55 year old"
-    age_match = re.search(r"(?:age|aged?)\s*[:\s]*(\d{2})|(\d{2})\s*(?=-year-old|year\s*old)", findings_lower)
+    age_match = _AGE_RE.search(findings_lower)
     if age_match:
         # Get the first non-None group
         age_str = age_match.group(1) or age_match.group(2)
         age = int(age_str)
         correct_category = _get_age_category(age)
         # Check for common misclassifications
-        if age >= 55 and "closely approaching advanced age" in analysis.lower():
+        if age >= 55 and "closely approaching advanced age" in analysis_lower:
             warnings.append(
                 f"AGE ERROR: Patient is {age} years old = \"{correct_category}\". "
                 f"Analysis incorrectly says \"closely approaching advanced age\" "
                 f"(that category is for ages 50-54 only)."
             )
-        if age >= 50 and age < 55 and "advanced age" in analysis.lower():
+        if age >= 50 and age < 55 and "advanced age" in analysis_lower:
             # Make sure it's not "closely approaching advanced age"
-            if "closely approaching advanced age" not in analysis.lower():
+            if "closely approaching advanced age" not in analysis_lower:
                 warnings.append(
                     f"AGE ERROR: Patient is {age} years old = \"{correct_category}\". "
                     f"Analysis may have the wrong age category."
                 )
 
+    # Remaining checks only apply to vision cases
+    has_vision = any(kw in findings_lower for kw in VISION_KEYWORDS)
+    if not has_vision:
+        return warnings
+
     # --- Calculation Check (vision cases) ---
-    vision_keywords = ["visual acuity", "snellen", "retinopathy", "visual field",
-                       "vision loss", "macular", "optic"]
-    has_vision = any(kw in findings_lower for kw in vision_keywords)
-    if has_vision:
-        # Check that actual numbers/percentages appear (not "cannot be calculated")
-        if "cannot be calculated" in analysis.lower() or "cannot be determined" in analysis.lower():
-            warnings.append(
-                "CALCULATION GAP: Analysis says values 'cannot be calculated' or "
-                "'cannot be determined' despite visual acuity data being available. "
-                "Use the Visual Acuity Reference Table to look up exact values."
-            )
+    # Check that actual numbers/percentages appear (not "cannot be calculated")
+    if "cannot be calculated" in analysis_lower or "cannot be determined" in analysis_lower:
+        warnings.append(
+            "CALCULATION GAP: Analysis says values 'cannot be calculated' or "
+            "'cannot be determined' despite visual acuity data being available. "
+            "Use the Visual Acuity Reference Table to look up exact values."
+        )
 
     # --- Hearing/Vision Contamination Check ---
-    if has_vision:
-        hearing_contaminants = ["audiologist", "audiometric", "otoscopic",
-                                "hearing evaluation", "cochlear", "audiological"]
-        found = [term for term in hearing_contaminants if term in analysis.lower()]
-        if found:
-            warnings.append(
-                f"CONTAMINATION WARNING: Vision case contains hearing-related "
-                f"recommendations: {', '.join(found)}. These should be removed."
-            )
+    found = [term for term in HEARING_CONTAMINANTS if term in analysis_lower]
+    if found:
+        warnings.append(
+            f"CONTAMINATION WARNING: Vision case contains hearing-related "
+            f"recommendations: {', '.join(found)}. These should be removed."
+        )
 
     return warnings
 
 
+# SSA age categories: _AGE_BOUNDS[i] is the first age of _AGE_LABELS[i + 1]
+_AGE_BOUNDS = (50, 55, 60, 65)
+_AGE_LABELS = (
+    "younger individual",
+    "closely approaching advanced age",
+    "advanced age",
+    "closely approaching retirement age",
+    "retirement age",
+)
+
+
 def _get_age_category(age: int) -> str:
     """Return the correct SSA age classification."""
-    if age < 50:
-        return "younger individual"
-    elif age < 55:
-        return "closely approaching advanced age"
-    elif age < 60:
-        return "advanced age"
-    elif age < 65:
-        return "closely approaching retirement age"
-    else:
-        return "retirement age"
-
-
-def analyze_medical_findings(medical_findings: str) -> dict:
+    return _AGE_LABELS[bisect_right(_AGE_BOUNDS, age)]
+
+
+def analyze_medical_findings(
+    medical_findings: str, on_delta: Callable[[str], None] | None = None
+) -> dict:
     """
     Main entry point for the RAG pipeline.
 
     Takes medical findings text and returns a structured analysis result.
+    Pass on_delta to receive Claude's analysis text incrementally as it streams.
     """
     # Validate input
     medical_findings = medical_findings.strip()
@@ -614,7 +826,7 @@ def analyze_medical_findings(medical_findings: str) -> dict:
 
     # Step 3: Call Claude for analysis
     try:
-        analysis_text = call_claude(messages)
+        analysis_text = call_claude(messages, on_delta=on_delta)
     except Exception as e:
         return {
             "status": "error",
@@ -636,10 +848,7 @@ def analyze_medical_findings(medical_findings: str) -> dict:
         analysis_text += warning_block
 
     # Step 5: Extract listing numbers mentioned in the response
-    matched_listings = list(
-        set(re.findall(r"(?:Listing\s+)?(\d{1,2}\.\d{2})", analysis_text))
-    )
-    matched_listings.sort()
+    matched_listings = sorted(set(_LISTING_RE.findall(analysis_text)))
 
     # Step 6: Build source links from retrieved documents
     sources = {}
@@ -647,12 +856,13 @@ def analyze_medical_findings(medical_findings: str) -> dict:
         meta = doc["metadata"]
         listing_num = meta.get("listing_number", "")
         source_url = meta.get("source_url", "")
-        if listing_num and source_url and listing_num not in sources:
-            sources[listing_num] = {
+        if listing_num and source_url:
+            # First doc for a listing wins
+            sources.setdefault(listing_num, {
                 "listing_number": listing_num,
                 "body_system": meta.get("body_system", ""),
                 "source_url": source_url,
-            }
+            })
 
     return {
         "status": "success",
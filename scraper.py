@@ -11,15 +11,43 @@ If SSA blocks requests (403), the scraper will:
 1. Try with browser-like headers
 2. Fall back to local HTML files in data/raw_html/
 3. Print instructions for manual download if neither works
+
+When lxml is installed (see requirements.txt), page text is extracted with
+lxml directly; otherwise BeautifulSoup with Python's built-in html.parser is used. Likewise, JSON
+output is written with orjson when installed and the stdlib json otherwise.
 """
 
+import codecs
+import gzip
+import hashlib
 import json
 import os
+import pickle
 import re
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlsplit
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+
+    HTML_PARSER = "lxml"
+except ImportError:
+    etree = lxml_html = None
+    HTML_PARSER = "html.parser"
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from config import (
     BLUE_BOOK_URLS,
@@ -32,6 +60,49 @@ from config import (
     SECTIONS_JSON,
 )
 
+# Sections fetched and parsed at once
+MAX_CONCURRENT_FETCHES = 4
+
+# Minimum spacing between requests to the same host, to be polite to SSA servers
+MIN_REQUEST_INTERVAL = 2.0
+
+
+class DomainRateLimiter:
+    """Enforces a minimum interval between requests to the same host.
+
+    Thread-safe: each caller reserves the next free slot for its host under
+    the lock, then sleeps outside it so other hosts aren't held up.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_rate_limiter = DomainRateLimiter(MIN_REQUEST_INTERVAL)
+
+# Read/write buffer for raw HTML cache files (pages are a few hundred KB)
+FILE_BUFFER_SIZE = 1 << 17
+
+# Shared HTTP session — all sections live on ssa.gov, so pooled keep-alive
+# connections save a TCP+TLS handshake per page
+_SESSION = requests.Session()
+_SESSION.headers.update(REQUEST_HEADERS)
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=MAX_CONCURRENT_FETCHES, pool_maxsize=2 * MAX_CONCURRENT_FETCHES),
+)
+
 
 def fetch_page(url: str, section_number: str) -> str | None:
     """
@@ -42,66 +113,234 @@ def fetch_page(url: str, section_number: str) -> str | None:
     """
     # Attempt 1: Fetch from SSA website
     try:
-        print(f"  Fetching from SSA: {url}")
-        response = requests.get(url, headers=REQUEST_HEADERS, timeout=15)
+        _rate_limiter.wait(url)
+        print(f"  [{section_number}] Fetching from SSA: {url}")
+        response = _SESSION.get(url, timeout=15)
         if response.status_code == 200:
-            # Cache the raw HTML for future use
-            save_raw_html(section_number, response.text)
-            return response.text
+            encoding = response.encoding or "utf-8"
+            html = response.content.decode(encoding, errors="replace")
+            # The cache is always read back as UTF-8, so only re-encode pages
+            # served in another charset; UTF-8 bytes are saved as received
+            if codecs.lookup(encoding).name == "utf-8":
+                save_raw_html(section_number, response.content)
+            else:
+                save_raw_html(section_number, html.encode("utf-8"))
+            return html
         else:
-            print(f"  Got status {response.status_code}, trying fallback...")
+            print(
+                f"  [{section_number}] Got status {response.status_code}, "
+                f"trying fallback..."
+            )
     except requests.RequestException as e:
-        print(f"  Request failed: {e}, trying fallback...")
+        print(f"  [{section_number}] Request failed: {e}, trying fallback...")
 
     # Attempt 2: Load from local cache
     return fetch_from_local(section_number)
 
 
 def fetch_from_local(section_number: str) -> str | None:
-    """Load HTML from data/raw_html/ fallback directory."""
-    filename = f"section_{section_number}.html"
-    filepath = os.path.join(RAW_HTML_DIR, filename)
-    if os.path.exists(filepath):
-        print(f"  Loading from local file: {filepath}")
-        with open(filepath, "r", encoding="utf-8") as f:
-            return f.read()
-    return None
-
+    """
+    Load HTML from data/raw_html/ fallback directory.
 
-def save_raw_html(section_number: str, html: str):
-    """Save raw HTML to data/raw_html/ for caching."""
+    Pages cached by this scraper are gzip-compressed (section_X.html.gz);
+    plain section_X.html files (manual downloads, download_pages.py, or older
+    caches) are still read. If both exist, the newer one wins.
+    """
+    base = os.path.join(RAW_HTML_DIR, f"section_{section_number}.html")
+    candidates = [path for path in (base + ".gz", base) if os.path.exists(path)]
+    if not candidates:
+        return None
+
+    filepath = max(candidates, key=os.path.getmtime)
+    print(f"  [{section_number}] Loading from local file: {filepath}")
+    if filepath.endswith(".gz"):
+        with gzip.open(filepath, "rb") as f:
+            return f.read().decode("utf-8", errors="replace")
+    print(f"  [{section_number}] (uncompressed cache; it's saved as .html.gz on the next successful fetch)")
+    with open(filepath, "r", encoding="utf-8", errors="replace", buffering=FILE_BUFFER_SIZE) as f:
+        return f.read()
+
+
+def save_raw_html(section_number: str, html: bytes):
+    """Save UTF-8 encoded HTML bytes to data/raw_html/ as gzip."""
     os.makedirs(RAW_HTML_DIR, exist_ok=True)
-    filename = f"section_{section_number}.html"
+    filename = f"section_{section_number}.html.gz"
     filepath = os.path.join(RAW_HTML_DIR, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
+    with gzip.open(filepath, "wb", compresslevel=6) as f:
         f.write(html)
 
 
+# Only build <div>/<main> subtrees when parsing — every content candidate is
+# one of these, so <head>, scripts, and other top-level markup are skipped
+CONTENT_STRAINER = SoupStrainer(["div", "main"])
+
+
+def _content_rank(tag) -> int | None:
+    """Priority of a tag as the content container (lower wins), or None."""
+    if tag.name == "main":
+        return 4
+    if tag.name != "div":
+        return None
+    classes = tag.get("class") or ()
+    if "field-items" in classes:
+        return 0
+    if tag.get("id") == "content":
+        return 1
+    if "content" in classes:
+        return 2
+    if tag.get("role") == "main":
+        return 3
+    return None
+
+
+def find_content_candidate(soup: BeautifulSoup) -> BeautifulSoup | None:
+    """
+    Find the main content area of the page, or None if no known container exists.
+    SSA pages use different structures, so we try multiple selectors, in order:
+    div.field-items, div#content, div.content, div[role=main], <main>.
+
+    Done in a single walk of the tree: the first tag (in document order) for
+    the best-ranked selector wins, stopping early once a div.field-items is seen.
+    """
+    best, best_rank = None, None
+    for tag in soup.descendants:
+        if tag.name is None:  # strings, comments
+            continue
+        rank = _content_rank(tag)
+        if rank is not None and (best_rank is None or rank < best_rank):
+            best, best_rank = tag, rank
+            if rank == 0:
+                break
+    return best
+
+
 def find_content_div(soup: BeautifulSoup) -> BeautifulSoup:
     """
     Find the main content area of the page.
     SSA pages use different structures, so we try multiple selectors.
     """
-    # Try common content selectors
-    for selector in [
-        {"class_": "field-items"},
-        {"id": "content"},
-        {"class_": "content"},
-        {"role": "main"},
-    ]:
-        found = soup.find("div", **selector)
-        if found:
-            return found
-
-    # Try <main> tag
-    main = soup.find("main")
-    if main:
-        return main
+    found = find_content_candidate(soup)
+    if found:
+        return found
 
     # Last resort: use body
     return soup.body if soup.body else soup
 
 
+def extract_text_bs4(html: str) -> str:
+    """Main content text, one stripped string per line, via BeautifulSoup."""
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=CONTENT_STRAINER)
+    content = find_content_candidate(soup)
+    if content is None:
+        # No known container — parse the whole page and fall back to <body>
+        content = find_content_div(BeautifulSoup(html, HTML_PARSER))
+    return "\n".join(content.stripped_strings)
+
+
+# Same selectors as find_content_candidate, in the same priority order
+CONTENT_XPATHS = (
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' field-items ')]",
+    "//div[@id='content']",
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' content ')]",
+    "//div[@role='main']",
+    "//main",
+)
+
+# Elements whose text BeautifulSoup leaves out of stripped_strings
+NON_CONTENT_TAGS = ("script", "style", "template")
+
+
+def extract_text_lxml(html: str) -> str:
+    """
+    Same output as extract_text_bs4, but walks lxml's C tree directly instead
+    of building BeautifulSoup node objects.
+    """
+    parser = lxml_html.HTMLParser(
+        remove_comments=True, remove_pis=True, remove_blank_text=True, encoding="utf-8"
+    )
+    try:
+        root = lxml_html.fromstring(html.encode("utf-8"), parser=parser)
+    except etree.ParserError:  # empty document
+        return ""
+
+    content = None
+    for xpath in CONTENT_XPATHS:
+        found = root.xpath(xpath)
+        if found:
+            content = found[0]
+            break
+    if content is None:
+        body = root.xpath("//body")
+        content = body[0] if body else root
+
+    etree.strip_elements(content, *NON_CONTENT_TAGS, with_tail=False)
+    return "\n".join(s for s in (t.strip() for t in content.itertext()) if s)
+
+
+@lru_cache(maxsize=None)
+def listing_pattern(section_prefix: str) -> re.Pattern:
+    """
+    Compiled pattern for individual listing starts (not the X.00 section intro).
+    Matches: "1.15 Title text" or "12.04 Title text" at line boundaries.
+    """
+    return re.compile(
+        rf"^({section_prefix}\.\d{{2}})\s+([A-Z].*?)$",
+        re.MULTILINE,
+    )
+
+
+def find_listing_starts(text: str, section_prefix: str) -> list[tuple[int, int, str, str]]:
+    """
+    Locate individual listing starts without running a multiline regex.
+
+    Equivalent to listing_pattern(section_prefix).finditer(text) — kept as the
+    reference implementation — but jumps between candidate lines with str.find
+    and checks each one by hand. Returns (start, title_end, listing_number, title)
+    tuples, where start/title_end match the regex's match.start()/match.end().
+    """
+    prefix = section_prefix + "."
+    number_end = len(prefix) + 2
+    needle = "\n" + prefix
+    size = len(text)
+    starts = []
+    line_start = 0 if text.startswith(prefix) else -1
+    search_from = 0
+    while True:
+        if line_start < 0:
+            found = text.find(needle, search_from)
+            if found < 0:
+                break
+            line_start = found + 1
+        search_from = line_start
+
+        # "<prefix>.<two digits>", whitespace (may span lines), then an uppercase title
+        digits_end = line_start + number_end
+        title_start = digits_end
+        while title_start < size and text[title_start].isspace():
+            title_start += 1
+        if (
+            text[digits_end - 2 : digits_end].isdecimal()
+            and digits_end < title_start < size
+            and "A" <= text[title_start] <= "Z"
+        ):
+            title_end = text.find("\n", title_start)
+            if title_end < 0:
+                title_end = size
+            starts.append(
+                (line_start, title_end, text[line_start:digits_end], text[title_start:title_end])
+            )
+            search_from = title_end
+        line_start = -1
+    return starts
+
+
+# Section 2.00 subsection headers: "B. How do we evaluate...", "C. Loss of ..."
+SUBSECTION_PATTERN = re.compile(
+    r"^([B-E])\.\s+(How do we .+|Loss of .+)",
+    re.MULTILINE,
+)
+
+
 def parse_section(html: str, section_number: str, body_system: str) -> dict:
     """
     Parse a Blue Book section page into intro text and individual listings.
@@ -112,9 +351,10 @@ def parse_section(html: str, section_number: str, body_system: str) -> dict:
             "listings": [ { listing_number, title, body_system, section_number, full_text, criteria_summary } ]
         }
     """
-    soup = BeautifulSoup(html, "html.parser")
-    content = find_content_div(soup)
-    text = content.get_text(separator="\n", strip=True)
+    if lxml_html is not None:
+        text = extract_text_lxml(html)
+    else:
+        text = extract_text_bs4(html)
 
     # Split the text into chunks based on listing number patterns.
     # Listing numbers look like: 1.15, 2.04, 12.06, 14.09
@@ -128,42 +368,37 @@ def parse_section(html: str, section_number: str, body_system: str) -> dict:
     # Individual listings start with a number like X.XX followed by title text
     section_prefix = section_number.split(".")[0]  # e.g., "1" from "1.00"
 
-    # Pattern to find individual listing starts (not the X.00 section intro)
-    # Matches: "1.15 Title text" or "12.04 Title text" at line boundaries
-    listing_pattern = re.compile(
-        rf"^({section_prefix}\.\d{{2}})\s+([A-Z].*?)$",
-        re.MULTILINE,
-    )
-
-    matches = list(listing_pattern.finditer(text))
+    matches = find_listing_starts(text, section_prefix)
 
     # Everything before the first listing match is the section intro
     if matches:
-        intro_text = text[: matches[0].start()].strip()
+        intro_text = text[: matches[0][0]].strip()
     else:
         intro_text = text.strip()
 
+    # Build source URL linking directly to this section on SSA website.
+    # body_system and source_url come straight from the config maps, so every
+    # listing in the section shares the same string objects.
+    source_url = SECTION_URL_MAP.get(section_number, "")
+
     # Extract individual listings
     listings = []
-    for i, match in enumerate(matches):
-        listing_number = match.group(1)
-        title_text = match.group(2).strip()
+    for i, (start, title_end, listing_number, title_text) in enumerate(matches):
+        # Interned: listing numbers are dedup keys and repeat across sections
+        listing_number = sys.intern(listing_number)
+        title_text = title_text.strip()
 
         # Get the full text: from this match to the next match (or end of text)
-        start = match.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        end = matches[i + 1][0] if i + 1 < len(matches) else len(text)
         full_text = text[start:end].strip()
 
-        # Create a brief criteria summary (first 300 chars after the title)
-        title_line = f"{listing_number} {title_text}"
-        remaining = full_text[len(title_line) :].strip()
-        criteria_summary = remaining[:300].strip()
+        # Create a brief criteria summary (first 300 chars after the title),
+        # slicing from the end of the title match rather than re-deriving it
+        remaining = text[title_end:end].strip()
+        criteria_summary = remaining[:300].rstrip()
         if len(remaining) > 300:
             criteria_summary += "..."
 
-        # Build source URL linking directly to this section on SSA website
-        source_url = SECTION_URL_MAP.get(section_number, "")
-
         listings.append(
             {
                 "listing_number": listing_number,
@@ -187,6 +422,23 @@ def parse_section(html: str, section_number: str, body_system: str) -> dict:
     }
 
 
+# Section 2.00 subsection metadata, keyed by subsection letter
+SUBSECTION_TOPICS = {
+    "A": "visual_disorders",
+    "B": "hearing_loss",
+    "C": "vestibular",
+    "D": "speech",
+    "E": "general",
+}
+SUBSECTION_TITLES = {
+    "A": "Visual Disorders Evaluation",
+    "B": "Hearing Loss Evaluation",
+    "C": "Vestibular Function Evaluation",
+    "D": "Speech Loss Evaluation",
+    "E": "General Evaluation Guidelines",
+}
+
+
 def split_section_2_listing(listings: list[dict]) -> list[dict]:
     """
     Split the mega-listing '2.00' into separate subsection documents.
@@ -208,66 +460,93 @@ def split_section_2_listing(listings: list[dict]) -> list[dict]:
 
         # Find subsection boundaries: B, C, D, E headers
         # Section A has no explicit header — it's everything before B
-        subsection_pattern = re.compile(
-            r"^([B-E])\.\s+(How do we .+|Loss of .+)",
-            re.MULTILINE,
-        )
-        matches = list(subsection_pattern.finditer(text))
+        matches = list(SUBSECTION_PATTERN.finditer(text))
 
         if not matches:
             # Fallback: keep as-is if headers not found
             result.append(listing)
             continue
 
-        # Define subsection metadata
-        topic_map = {
-            "A": "visual_disorders",
-            "B": "hearing_loss",
-            "C": "vestibular",
-            "D": "speech",
-            "E": "general",
-        }
-        topic_titles = {
-            "A": "Visual Disorders Evaluation",
-            "B": "Hearing Loss Evaluation",
-            "C": "Vestibular Function Evaluation",
-            "D": "Speech Loss Evaluation",
-            "E": "General Evaluation Guidelines",
-        }
+        # Subsection start offsets: A has no explicit header — it's everything
+        # before B. A trailing sentinel closes the last subsection.
+        offsets = [("A", 0)]
+        offsets += [(m.group(1), m.start()) for m in matches]
+        offsets.append((None, len(text)))
 
-        # Build subsection boundaries: [(letter, start, end), ...]
-        boundaries = []
-        # Section A: from start to first match
-        boundaries.append(("A", 0, matches[0].start()))
-        # Sections B through E
-        for i, match in enumerate(matches):
-            letter = match.group(1)
-            start = match.start()
-            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-            boundaries.append((letter, start, end))
-
-        for letter, start, end in boundaries:
+        for (letter, start), (_, end) in zip(offsets, offsets[1:]):
             sub_text = text[start:end].strip()
             if not sub_text:
                 continue
 
             result.append({
                 "listing_number": f"2.00_{letter}",
-                "title": f"Section 2.00{letter} - {topic_titles[letter]}",
+                "title": f"Section 2.00{letter} - {SUBSECTION_TITLES[letter]}",
                 "body_system": listing["body_system"],
                 "section_number": listing["section_number"],
                 "full_text": sub_text,
                 "criteria_summary": sub_text[:300].strip() + ("..." if len(sub_text) > 300 else ""),
                 "source_url": listing["source_url"],
                 "subsection": letter,
-                "subsection_topic": topic_map[letter],
+                "subsection_topic": SUBSECTION_TOPICS[letter],
             })
 
-        print(f"  Split listing 2.00 into {len(boundaries)} subsections: {[b[0] for b in boundaries]}")
+        letters = [letter for letter, _ in offsets[:-1]]
+        print(f"  Split listing 2.00 into {len(letters)} subsections: {letters}")
+
+    return result
+
+
+# Bump whenever parse_section's output changes, to invalidate cached parses
+PARSE_CACHE_VERSION = 1
+
+
+def _parse_cache_path(section_number: str) -> str:
+    return os.path.join(RAW_HTML_DIR, f"section_{section_number}.pkl")
+
 
+def parse_section_cached(html: str, section_number: str, body_system: str) -> dict:
+    """
+    parse_section, reusing the previous result when the page HTML is unchanged.
+
+    Results are pickled next to the raw HTML along with a SHA-256 of the
+    HTML, PARSE_CACHE_VERSION and the text extractor/parser in use; any change
+    to these forces a reparse.
+    """
+    extractor = "lxml" if lxml_html is not None else "bs4"
+    digest = hashlib.sha256(
+        f"{PARSE_CACHE_VERSION}:{extractor}:{HTML_PARSER}:{body_system}:".encode("utf-8")
+        + html.encode("utf-8")
+    ).hexdigest()
+    cache_path = _parse_cache_path(section_number)
+
+    try:
+        with open(cache_path, "rb", buffering=FILE_BUFFER_SIZE) as f:
+            cached = pickle.load(f)
+        if cached["sha256"] == digest:
+            print(f"  [{section_number}] HTML unchanged, using cached parse")
+            return cached["result"]
+    except (
+        OSError, pickle.UnpicklingError, EOFError,
+        KeyError, TypeError, ValueError, AttributeError, ImportError,
+    ):
+        pass
+
+    result = parse_section(html, section_number, body_system)
+    os.makedirs(RAW_HTML_DIR, exist_ok=True)
+    with open(cache_path, "wb", buffering=FILE_BUFFER_SIZE) as f:
+        pickle.dump({"sha256": digest, "result": result}, f, protocol=5)
     return result
 
 
+def _scrape_section(section_number: str, url: str) -> tuple[str, str, str, dict | None]:
+    """Fetch and parse one section. Returns (number, url, body_system, result-or-None)."""
+    body_system = SECTION_MAP.get(section_number, "Unknown")
+    html = fetch_page(url, section_number)
+    if html is None:
+        return section_number, url, body_system, None
+    return section_number, url, body_system, parse_section_cached(html, section_number, body_system)
+
+
 def scrape_all() -> tuple[list[dict], list[dict]]:
     """
     Scrape all 14 Blue Book sections.
@@ -275,35 +554,34 @@ def scrape_all() -> tuple[list[dict], list[dict]]:
     Returns:
         (all_listings, all_sections) - two lists of dicts
     """
-    all_listings = []
+    # listing_number -> (len(full_text), listing); duplicates across sections are
+    # merged as they arrive, keeping the version with the longest full_text
+    deduped: dict[str, tuple[int, dict]] = {}
     all_sections = []
     failed_sections = []
 
-    for section_number, url in BLUE_BOOK_URLS:
-        body_system = SECTION_MAP.get(section_number, "Unknown")
-        print(f"\n[{section_number}] {body_system}")
-
-        html = fetch_page(url, section_number)
-        if html is None:
-            print(f"  FAILED - Could not fetch section {section_number}")
-            failed_sections.append((section_number, body_system, url))
-            continue
+    # Fetch and parse sections concurrently; the rate limiter still spaces out
+    # requests to the same host. Results come back in BLUE_BOOK_URLS order.
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as pool:
+        results = pool.map(lambda item: _scrape_section(*item), BLUE_BOOK_URLS)
 
-        result = parse_section(html, section_number, body_system)
-        all_sections.append(result["section_intro"])
-        all_listings.extend(result["listings"])
-        print(f"  Found {len(result['listings'])} listings")
+        for section_number, url, body_system, result in results:
+            print(f"\n[{section_number}] {body_system}")
+            if result is None:
+                print(f"  FAILED - Could not fetch section {section_number}")
+                failed_sections.append((section_number, body_system, url))
+                continue
 
-        # Be polite to SSA servers
-        time.sleep(2)
+            all_sections.append(result["section_intro"])
+            for listing in result["listings"]:
+                num = listing["listing_number"]
+                length = len(listing["full_text"])
+                stored = deduped.get(num)
+                if stored is None or length > stored[0]:
+                    deduped[num] = (length, listing)
+            print(f"  Found {len(result['listings'])} listings")
 
-    # Deduplicate listings: keep the version with the longest full_text
-    deduped = {}
-    for listing in all_listings:
-        num = listing["listing_number"]
-        if num not in deduped or len(listing["full_text"]) > len(deduped[num]["full_text"]):
-            deduped[num] = listing
-    all_listings = list(deduped.values())
+    all_listings = [listing for _, listing in deduped.values()]
 
     # Split Section 2.00 mega-listing into separate vision/hearing/etc. subsections
     all_listings = split_section_2_listing(all_listings)
@@ -326,16 +604,38 @@ def scrape_all() -> tuple[list[dict], list[dict]]:
     return all_listings, all_sections
 
 
+def _write_json(path: str, data: list[dict]):
+    """
+    Write an indented UTF-8 JSON array, using orjson when available.
+
+    Items are serialized and written one at a time, so only one listing's
+    encoded bytes are held in memory alongside the list itself.
+    """
+    if orjson is None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return
+    with open(path, "wb", buffering=1 << 20) as f:
+        if not data:
+            f.write(b"[]")
+            return
+        f.write(b"[\n  ")
+        for i, item in enumerate(data):
+            if i:
+                f.write(b",\n  ")
+            # Re-indent each item one level so the output matches indent=2
+            f.write(orjson.dumps(item, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+        f.write(b"\n]")
+
+
 def save_data(listings: list[dict], sections: list[dict]):
     """Save scraped data to JSON files."""
     os.makedirs(DATA_DIR, exist_ok=True)
 
-    with open(LISTINGS_JSON, "w", encoding="utf-8") as f:
-        json.dump(listings, f, indent=2, ensure_ascii=False)
+    _write_json(LISTINGS_JSON, listings)
     print(f"\nSaved {len(listings)} listings to {LISTINGS_JSON}")
 
-    with open(SECTIONS_JSON, "w", encoding="utf-8") as f:
-        json.dump(sections, f, indent=2, ensure_ascii=False)
+    _write_json(SECTIONS_JSON, sections)
     print(f"Saved {len(sections)} section intros to {SECTIONS_JSON}")
 
 
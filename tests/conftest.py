@@ -2,10 +2,12 @@
 Shared fixtures for Blue Book RAG Agent tests.
 """
 
-import json
 import os
+import shutil
 import sys
+from unittest.mock import patch
 
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 
@@ -14,14 +16,72 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 
 @pytest.fixture(scope="session")
-def chroma_collection():
-    """Real ChromaDB collection (read-only). Skip if DB doesn't exist."""
-    from rag import get_chroma_collection
+def chroma_collection(tmp_path_factory):
+    """
+    Real ChromaDB collection (read-only). Skip if DB doesn't exist.
 
-    try:
-        return get_chroma_collection()
-    except Exception:
-        pytest.skip("ChromaDB not available — run build_db.py first")
+    Under pytest-xdist (pytest -n auto), each worker opens its own copy of the
+    database: PersistentClient isn't safe to share across processes.
+    """
+    import rag
+
+    with pytest.MonkeyPatch.context() as mp:
+        if os.environ.get("PYTEST_XDIST_WORKER") and os.path.isdir(rag.CHROMA_DB_PATH):
+            # getbasetemp() is already per-worker under xdist
+            worker_db = tmp_path_factory.getbasetemp() / "chroma_db"
+            shutil.copytree(rag.CHROMA_DB_PATH, worker_db)
+            mp.setattr(rag, "CHROMA_DB_PATH", str(worker_db))
+
+        try:
+            collection = rag.get_chroma_collection()
+        except Exception:
+            pytest.skip("ChromaDB not available — run build_db.py first")
+        yield collection
+
+
+@pytest.fixture(scope="session")
+def cached_search(chroma_collection):
+    """
+    search_blue_book memoized per (query, top_k) for the whole session.
+
+    Also patched into rag, so analyze_medical_findings() reuses the same
+    results instead of re-embedding and re-querying for repeated findings.
+    """
+    import rag
+
+    search = rag.search_blue_book
+    memo = {}
+
+    def cached(query, top_k=rag.TOP_K):
+        key = (query, top_k)
+        if key not in memo:
+            memo[key] = search(query, top_k)
+        return list(memo[key])
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(rag, "search_blue_book", cached)
+        yield cached
+
+
+@pytest.fixture(scope="session")
+def vision_retrieval(cached_search, sample_vision_findings):
+    """(retrieved_docs, messages) for the vision sample — retrieval and prompt built once."""
+    from rag import build_claude_prompt
+
+    docs = cached_search(sample_vision_findings)
+    return docs, build_claude_prompt(sample_vision_findings, docs)
+
+
+@pytest.fixture
+def vision_pipeline(vision_retrieval):
+    """
+    Patch rag so analyze_medical_findings() on the vision sample reuses the
+    session's retrieval and prompt; only the mocked Claude response varies.
+    """
+    docs, messages = vision_retrieval
+    with patch("rag.search_blue_book", return_value=docs), \
+            patch("rag.build_claude_prompt", return_value=messages):
+        yield
 
 
 @pytest.fixture(scope="session")
@@ -30,8 +90,8 @@ def listings_data():
     path = os.path.join(os.path.dirname(__file__), "..", "data", "blue_book_listings.json")
     if not os.path.exists(path):
         pytest.skip("blue_book_listings.json not found — run scraper.py first")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
 
 
 @pytest.fixture(scope="session")
@@ -40,15 +100,16 @@ def valid_listing_numbers(listings_data):
     return {listing["listing_number"] for listing in listings_data}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_client():
-    """FastAPI test client."""
+    """FastAPI test client, shared by the whole session (one lifespan cycle)."""
     from main import app
 
-    return TestClient(app)
+    with TestClient(app) as client:
+        yield client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_vision_findings():
     return (
         "62-year-old female, former secretary. Diagnosed with diabetic retinopathy "
@@ -58,7 +119,7 @@ def sample_vision_findings():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_spine_findings():
     return (
         "55-year-old male, former construction worker. MRI shows L4-L5 disc "
@@ -68,7 +129,7 @@ def sample_spine_findings():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_cardiac_findings():
     return (
         "52-year-old male, former warehouse worker. Diagnosed with congestive "
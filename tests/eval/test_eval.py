@@ -5,10 +5,11 @@ Tests retrieval quality and anti-hallucination using real ChromaDB.
 No API key needed (tests retrieval only, not Claude).
 """
 
-import json
 import os
 import sys
+from functools import lru_cache
 
+import orjson
 import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -20,43 +21,50 @@ from rag import search_blue_book
 EVAL_DIR = os.path.dirname(__file__)
 EVAL_CASES_PATH = os.path.join(EVAL_DIR, "eval_cases.json")
 
-with open(EVAL_CASES_PATH, "r", encoding="utf-8") as f:
-    EVAL_CASES = json.load(f)
+with open(EVAL_CASES_PATH, "rb") as f:
+    EVAL_CASES = orjson.loads(f.read())
 
+# valid_listing_numbers comes from the session-scoped fixture in tests/conftest.py,
+# so the listings JSON is parsed once per session rather than once per module
 
-@pytest.fixture(scope="module")
-def valid_listing_numbers():
-    """Load all valid listing numbers from the JSON dataset."""
-    listings_path = os.path.join(EVAL_DIR, "..", "..", "data", "blue_book_listings.json")
-    if not os.path.exists(listings_path):
-        pytest.skip("blue_book_listings.json not found — run scraper.py first")
-    with open(listings_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return {item["listing_number"] for item in data}
 
+# One (case, expected listing) pair per test, so each failure is reported separately
+EXPECTED_LISTING_CASES = [
+    pytest.param(case, expected, id=f"{case['id']}-{expected}")
+    for case in EVAL_CASES
+    for expected in case["expected_listings"]
+]
 
-def _get_retrieved_listing_numbers(medical_findings: str) -> set:
+
+@lru_cache(maxsize=None)
+def _search_cached(medical_findings: str) -> tuple:
+    """Run search once per findings text; every test for a case reuses it."""
+    return tuple(search_blue_book(medical_findings))
+
+
+@lru_cache(maxsize=None)
+def _get_retrieved_listing_numbers(medical_findings: str) -> frozenset:
     """Run search and extract listing numbers from results."""
-    results = search_blue_book(medical_findings)
     listing_nums = set()
-    for r in results:
+    for r in _search_cached(medical_findings):
         ln = r["metadata"].get("listing_number", "")
         if ln and "." in ln:
             listing_nums.add(ln)
-    return listing_nums
+    return frozenset(listing_nums)
 
 
-@pytest.mark.parametrize("case", EVAL_CASES, ids=[c["id"] for c in EVAL_CASES])
-def test_expected_listings_retrieved(case):
+@pytest.mark.usefixtures("chroma_collection")
+@pytest.mark.parametrize("case, expected", EXPECTED_LISTING_CASES)
+def test_expected_listings_retrieved(case, expected):
     """Each expected listing should appear in retrieval results."""
     retrieved = _get_retrieved_listing_numbers(case["medical_findings"])
-    for expected in case["expected_listings"]:
-        assert expected in retrieved, (
-            f"[{case['id']}] Expected listing {expected} not found in results. "
-            f"Retrieved: {sorted(retrieved)}"
-        )
+    assert expected in retrieved, (
+        f"[{case['id']}] Expected listing {expected} not found in results. "
+        f"Retrieved: {sorted(retrieved)}"
+    )
 
 
+@pytest.mark.usefixtures("chroma_collection")
 @pytest.mark.parametrize("case", EVAL_CASES, ids=[c["id"] for c in EVAL_CASES])
 def test_no_contamination_listings(case):
     """Unexpected listings should NOT appear in results."""
@@ -70,6 +78,7 @@ def test_no_contamination_listings(case):
         )
 
 
+@pytest.mark.usefixtures("chroma_collection")
 @pytest.mark.parametrize("case", EVAL_CASES, ids=[c["id"] for c in EVAL_CASES])
 def test_no_hallucinated_listings(case, valid_listing_numbers):
     """Every retrieved listing must exist in the actual Blue Book database."""
@@ -81,10 +90,11 @@ def test_no_hallucinated_listings(case, valid_listing_numbers):
         )
 
 
+@pytest.mark.usefixtures("chroma_collection")
 @pytest.mark.parametrize("case", EVAL_CASES, ids=[c["id"] for c in EVAL_CASES])
 def test_retrieval_returns_results(case):
     """Every eval case should return at least some results."""
-    results = search_blue_book(case["medical_findings"])
+    results = _search_cached(case["medical_findings"])
     assert len(results) > 0, f"[{case['id']}] No results returned for: {case['description']}"
 
 
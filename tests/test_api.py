@@ -6,30 +6,25 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 import pytest
-from fastapi.testclient import TestClient
 
-from main import app
 
-client = TestClient(app)
-
-
-def test_health_endpoint():
-    response = client.get("/health")
+def test_health_endpoint(test_client):
+    response = test_client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
     assert "version" in data
 
 
-def test_listings_endpoint():
-    response = client.get("/listings")
+def test_listings_endpoint(test_client):
+    response = test_client.get("/listings")
     assert response.status_code == 200
     listings = response.json()
     assert len(listings) >= 100, f"Expected >= 100 listings, got {len(listings)}"
 
 
-def test_listings_have_required_fields():
-    response = client.get("/listings")
+def test_listings_have_required_fields(test_client):
+    response = test_client.get("/listings")
     listings = response.json()
     if listings:
         first = listings[0]
@@ -38,30 +33,30 @@ def test_listings_have_required_fields():
         assert "body_system" in first
 
 
-def test_get_specific_listing():
-    response = client.get("/listings/1.15")
+def test_get_specific_listing(test_client):
+    response = test_client.get("/listings/1.15")
     assert response.status_code == 200
     data = response.json()
     assert data["listing_number"] == "1.15"
 
 
-def test_get_nonexistent_listing():
-    response = client.get("/listings/99.99")
+def test_get_nonexistent_listing(test_client):
+    response = test_client.get("/listings/99.99")
     assert response.status_code == 404
 
 
-def test_analyze_empty_body():
-    response = client.post("/analyze", json={"medical_findings": ""})
+def test_analyze_empty_body(test_client):
+    response = test_client.post("/analyze", json={"medical_findings": ""})
     assert response.status_code == 400
 
 
-def test_analyze_too_short():
-    response = client.post("/analyze", json={"medical_findings": "back pain"})
+def test_analyze_too_short(test_client):
+    response = test_client.post("/analyze", json={"medical_findings": "back pain"})
     assert response.status_code == 400
 
 
-def test_analyze_missing_field():
-    response = client.post("/analyze", json={})
+def test_analyze_missing_field(test_client):
+    response = test_client.post("/analyze", json={})
     assert response.status_code == 422  # Pydantic validation error
 
 
@@ -71,3 +66,46 @@ def test_response_model_has_validation_warnings():
 
     fields = AnalyzeResponse.model_fields
     assert "validation_warnings" in fields
+
+
+def test_index_versions_assets_by_content_hash(test_client):
+    from main import _asset_version
+
+    response = test_client.get("/")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+    assert f"/static/style.css?v={_asset_version('style.css')}" in response.text
+    assert f"/static/script.js?v={_asset_version('script.js')}" in response.text
+
+
+def test_static_assets_immutable_only_when_versioned(test_client):
+    versioned = test_client.get("/static/style.css?v=abc123")
+    assert "immutable" in versioned.headers["cache-control"]
+
+    unversioned = test_client.get("/static/style.css")
+    assert unversioned.headers["cache-control"] == "no-cache"
+    assert "etag" in unversioned.headers
+
+
+def test_listings_picked_up_once_file_exists(test_client, monkeypatch, tmp_path):
+    import main
+
+    def clear_caches():
+        for fn in (main._load_listings, main._listing_index, main._listings_summary_bytes):
+            fn.cache_clear()
+
+    listings_path = tmp_path / "listings.json"
+    monkeypatch.setattr(main, "LISTINGS_JSON", str(listings_path))
+    clear_caches()
+    try:
+        assert test_client.get("/listings").json() == []
+        assert test_client.get("/listings/1.15").status_code == 404
+
+        listings_path.write_text(
+            '[{"listing_number": "1.15", "title": "Spine", "body_system": "Musculoskeletal"}]'
+        )
+        assert [l["listing_number"] for l in test_client.get("/listings").json()] == ["1.15"]
+        assert test_client.get("/listings/1.15").status_code == 200
+    finally:
+        monkeypatch.undo()
+        clear_caches()
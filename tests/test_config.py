@@ -5,6 +5,8 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+import pytest
+
 from config import (
     BLUE_BOOK_URLS,
     CHROMA_COLLECTION_NAME,
@@ -51,22 +53,12 @@ def test_chroma_collection_name():
     assert CHROMA_COLLECTION_NAME == "blue_book"
 
 
-def test_openrouter_headers_raises_without_key():
-    original = os.environ.get("OPENROUTER_API_KEY")
-    try:
-        os.environ["OPENROUTER_API_KEY"] = ""
-        # Reload config to pick up empty key
-        import importlib
-        import config
-        importlib.reload(config)
-        try:
-            config.get_openrouter_headers()
-            assert False, "Should have raised ValueError"
-        except ValueError:
-            pass
-    finally:
-        if original:
-            os.environ["OPENROUTER_API_KEY"] = original
-            import importlib
-            import config
-            importlib.reload(config)
+def test_openrouter_headers_raises_without_key(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "")
+    with pytest.raises(ValueError):
+        get_openrouter_headers()
+
+
+def test_openrouter_headers_reads_key_at_call_time(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    assert get_openrouter_headers()["Authorization"] == "Bearer test-key"
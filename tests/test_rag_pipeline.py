@@ -1,18 +1,38 @@
 """Tests for the RAG pipeline — mocks Claude API calls."""
 
+import json
+import socket
 import sys
 import os
+import threading
 from unittest.mock import patch, MagicMock
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from rag import build_claude_prompt, search_blue_book, analyze_medical_findings
+import pytest
+import requests
 
+import rag
+from rag import build_claude_prompt, call_claude, analyze_medical_findings
 
-def test_build_claude_prompt_structure(sample_vision_findings):
+
+def _resp(status_code, body=None, text=""):
+    """Non-streaming requests.Response with the given status and JSON body (or text)."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode("utf-8") if body is not None else text.encode("utf-8")
+    response._content_consumed = True
+    response.encoding = "utf-8"
+    return response
+
+
+def _claude_resp(analysis):
+    return _resp(200, body={"choices": [{"message": {"content": analysis}}]})
+
+
+def test_build_claude_prompt_structure(vision_retrieval, sample_vision_findings):
     """Prompt should have system + user messages with correct structure."""
-    docs = search_blue_book(sample_vision_findings)
-    messages = build_claude_prompt(sample_vision_findings, docs)
+    _, messages = vision_retrieval
 
     assert len(messages) == 2
     assert messages[0]["role"] == "system"
@@ -22,18 +42,17 @@ def test_build_claude_prompt_structure(sample_vision_findings):
     assert sample_vision_findings in messages[1]["content"]
 
 
-def test_prompt_contains_retrieved_listings(sample_spine_findings):
-    docs = search_blue_book(sample_spine_findings)
+def test_prompt_contains_retrieved_listings(cached_search, sample_spine_findings):
+    docs = cached_search(sample_spine_findings)
     messages = build_claude_prompt(sample_spine_findings, docs)
     content = messages[1]["content"]
     # Should contain at least one listing number
     assert "Listing" in content
 
 
-def test_hearing_subsections_filtered_for_vision_case(sample_vision_findings):
+def test_hearing_subsections_filtered_for_vision_case(vision_retrieval):
     """Vision cases should NOT include hearing subsection docs."""
-    docs = search_blue_book(sample_vision_findings)
-    messages = build_claude_prompt(sample_vision_findings, docs)
+    _, messages = vision_retrieval
     content = messages[1]["content"]
     # The prompt should not include hearing evaluation guidelines for a vision case
     # (hearing_loss subsection topic should be filtered out)
@@ -58,15 +77,9 @@ def test_system_prompt_contains_visual_acuity_table():
     assert "Visual Acuity" in system
 
 
-def test_analyze_with_mocked_claude(sample_vision_findings, mock_claude_good_response):
+def test_analyze_with_mocked_claude(vision_pipeline, sample_vision_findings, mock_claude_good_response):
     """Full pipeline with mocked Claude should return success + no critical warnings."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
-        "choices": [{"message": {"content": mock_claude_good_response}}]
-    }
-
-    with patch("rag.requests.post", return_value=mock_response):
+    with patch("rag._SESSION.post", return_value=_claude_resp(mock_claude_good_response)):
         result = analyze_medical_findings(sample_vision_findings)
 
     assert result["status"] == "success"
@@ -76,15 +89,9 @@ def test_analyze_with_mocked_claude(sample_vision_findings, mock_claude_good_res
     assert isinstance(result["matched_listings"], list)
 
 
-def test_analyze_with_bad_response_catches_warnings(sample_vision_findings, mock_claude_bad_response):
+def test_analyze_with_bad_response_catches_warnings(vision_pipeline, sample_vision_findings, mock_claude_bad_response):
     """Mocked bad response should trigger validation warnings."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
-        "choices": [{"message": {"content": mock_claude_bad_response}}]
-    }
-
-    with patch("rag.requests.post", return_value=mock_response):
+    with patch("rag._SESSION.post", return_value=_claude_resp(mock_claude_bad_response)):
         result = analyze_medical_findings(sample_vision_findings)
 
     assert result["status"] == "success"
@@ -101,14 +108,73 @@ def test_analyze_short_input():
     assert result["status"] == "error"
 
 
-def test_analyze_api_error_handling(sample_vision_findings):
+def test_analyze_api_error_handling(vision_pipeline, sample_vision_findings):
     """Should handle API errors gracefully."""
-    mock_response = MagicMock()
-    mock_response.status_code = 500
-    mock_response.text = "Internal Server Error"
-
-    with patch("rag.requests.post", return_value=mock_response):
+    with patch("rag._SESSION.post", return_value=_resp(500, text="Internal Server Error")):
         result = analyze_medical_findings(sample_vision_findings)
 
     assert result["status"] == "error"
     assert "error" in result
+
+
+def test_call_claude_streams_deltas():
+    """Streaming mode should pass each delta to the callback and return the full text."""
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.iter_lines.return_value = [
+        ": OPENROUTER PROCESSING",
+        "",
+        'data: {"choices": [{"delta": {"content": "## 1. POTENTIALLY "}}]}',
+        'data: {"choices": [{"delta": {"content": "MATCHING LISTINGS"}}]}',
+        "data: [DONE]",
+    ]
+    deltas = []
+
+    with patch("rag._SESSION.post", return_value=mock_response), \
+            patch("rag.get_openrouter_headers", return_value={}):
+        text = call_claude([{"role": "user", "content": "test"}], on_delta=deltas.append)
+
+    assert text == "## 1. POTENTIALLY MATCHING LISTINGS"
+    assert deltas == ["## 1. POTENTIALLY ", "MATCHING LISTINGS"]
+    mock_response.__exit__.assert_called_once()
+
+
+def test_call_claude_read_timeout_is_reported_and_not_retried(monkeypatch):
+    """A server that accepts but never answers should give the timeout message after one attempt."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    listener.settimeout(0.1)
+    connections = []
+    stop = threading.Event()
+
+    def accept_and_hang():
+        while not stop.is_set():
+            try:
+                conn, _ = listener.accept()
+            except socket.timeout:
+                continue
+            connections.append(conn)  # keep open, never respond
+
+    thread = threading.Thread(target=accept_and_hang, daemon=True)
+    thread.start()
+
+    # Same adapter (and Retry policy) as production, mounted for plain http
+    session = requests.Session()
+    session.mount("http://", rag._SESSION.get_adapter("https://openrouter.ai"))
+    monkeypatch.setattr(rag, "_SESSION", session)
+    monkeypatch.setattr(rag, "OPENROUTER_BASE_URL", f"http://127.0.0.1:{listener.getsockname()[1]}/")
+    monkeypatch.setattr(rag, "OPENROUTER_TIMEOUT", 0.3)
+    monkeypatch.setattr(rag, "get_openrouter_headers", lambda: {})
+
+    try:
+        with pytest.raises(Exception, match="timed out"):
+            call_claude([{"role": "user", "content": "test"}])
+    finally:
+        stop.set()
+        thread.join()
+        listener.close()
+        for conn in connections:
+            conn.close()
+
+    assert len(connections) == 1, "POST was replayed after a read timeout"
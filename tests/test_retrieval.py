@@ -5,17 +5,24 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+import numpy as np
 import pytest
 
-from rag import search_blue_book, get_chroma_collection
+import rag
 
 
-@pytest.fixture(scope="module")
-def collection():
-    try:
-        return get_chroma_collection()
-    except Exception:
-        pytest.skip("ChromaDB not available — run build_db.py first")
+@pytest.fixture(scope="session", autouse=True)
+def collection(chroma_collection):
+    # Session-wide handle from conftest; it's also rag's cached collection,
+    # so the search tests below (via cached_search) reuse the same open client (and
+    # skip, rather than error, when the database hasn't been built).
+    return chroma_collection
+
+
+@pytest.fixture(scope="session")
+def embed(collection):
+    """Embed query texts via rag's cached embedder, as a float32 array for query_embeddings."""
+    return lambda texts: np.asarray(rag._embed_queries(texts), dtype=np.float32)
 
 
 def test_collection_has_enough_docs(collection):
@@ -23,9 +30,9 @@ def test_collection_has_enough_docs(collection):
     assert count >= 140, f"Expected >= 140 docs, got {count}"
 
 
-def test_spine_query_returns_section_1(collection):
+def test_spine_query_returns_section_1(collection, embed):
     results = collection.query(
-        query_texts=["lumbar disc herniation nerve root compression"],
+        query_embeddings=embed(["lumbar disc herniation nerve root compression"]),
         n_results=5,
         include=["metadatas"],
     )
@@ -33,9 +40,9 @@ def test_spine_query_returns_section_1(collection):
     assert any(ln.startswith("1.") for ln in listing_nums), f"No section 1 listings: {listing_nums}"
 
 
-def test_vision_query_returns_vision_listings(collection):
+def test_vision_query_returns_vision_listings(collection, embed):
     results = collection.query(
-        query_texts=["visual acuity loss diabetic retinopathy"],
+        query_embeddings=embed(["visual acuity loss diabetic retinopathy"]),
         n_results=10,
         include=["metadatas"],
     )
@@ -45,9 +52,9 @@ def test_vision_query_returns_vision_listings(collection):
     assert len(found) >= 2, f"Expected vision listings, got {listing_nums}"
 
 
-def test_hearing_query_returns_hearing_listings(collection):
+def test_hearing_query_returns_hearing_listings(collection, embed):
     results = collection.query(
-        query_texts=["hearing loss audiometric cochlear"],
+        query_embeddings=embed(["hearing loss audiometric cochlear"]),
         n_results=10,
         include=["metadatas"],
     )
@@ -57,36 +64,36 @@ def test_hearing_query_returns_hearing_listings(collection):
     assert len(found) >= 1, f"Expected hearing listings, got {listing_nums}"
 
 
-def test_search_blue_book_deduplicates():
+def test_search_blue_book_deduplicates(cached_search):
     """Multi-query search should not return duplicate doc IDs."""
-    results = search_blue_book("Diabetes with retinopathy and peripheral neuropathy")
+    results = cached_search("Diabetes with retinopathy and peripheral neuropathy")
     ids = [r["id"] for r in results]
     assert len(ids) == len(set(ids)), f"Duplicate IDs found: {ids}"
 
 
-def test_search_blue_book_returns_results():
-    results = search_blue_book("Congestive heart failure ejection fraction 30%")
+def test_search_blue_book_returns_results(cached_search):
+    results = cached_search("Congestive heart failure ejection fraction 30%")
     assert len(results) > 0
 
 
-def test_all_results_have_metadata():
-    results = search_blue_book("COPD chronic pulmonary disease")
+def test_all_results_have_metadata(cached_search):
+    results = cached_search("COPD chronic pulmonary disease")
     for r in results:
         assert "metadata" in r
         assert "text" in r
         assert "id" in r
 
 
-def test_distance_threshold():
+def test_distance_threshold(cached_search):
     """All results should be within the MAX_DISTANCE threshold."""
-    results = search_blue_book("Lumbar disc herniation with radiculopathy")
+    results = cached_search("Lumbar disc herniation with radiculopathy")
     for r in results:
         assert r["distance"] <= 1.2, f"Result {r['id']} has distance {r['distance']} > 1.2"
 
 
-def test_multi_condition_finds_all_systems():
+def test_multi_condition_finds_all_systems(cached_search):
     """Multi-query should find listings from multiple body systems."""
-    results = search_blue_book(
+    results = cached_search(
         "Diabetes with retinopathy, peripheral neuropathy, and chronic kidney disease stage 4"
     )
     sections_found = set()
@@ -0,0 +1,116 @@
+"""Tests for find_listing_starts() — must agree with the listing_pattern() regex."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from scraper import find_listing_starts, listing_pattern
+
+
+def _regex_starts(text, section_prefix):
+    return [
+        (m.start(), m.end(), m.group(1), m.group(2))
+        for m in listing_pattern(section_prefix).finditer(text)
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "1.00 Intro\n1.15 Disorders of the skeletal spine\nCriteria text\n1.16 Lumbar spinal stenosis",
+        "1.15 Title at start of text",
+        "Intro\n1.15\nTitle on the next line\nbody",
+        "1.15\n\n1.16 Second listing",
+        "1.15A sub-criterion\n1.1 Short\n11.02 Other section\nsee 1.15 inline",
+        "1.18 lowercase title\n1.20  Double space\r\n1.21\tTabbed",
+        "1.24 \n1.",
+        "",
+    ],
+)
+def test_find_listing_starts_matches_regex(text):
+    assert find_listing_starts(text, "1") == _regex_starts(text, "1")
+
+
+def test_find_listing_starts_two_digit_section():
+    text = "12.00 Mental Disorders\n12.02 Neurocognitive disorders\nA. Medical documentation"
+    assert find_listing_starts(text, "12") == _regex_starts(text, "12")
+    assert [s[2] for s in find_listing_starts(text, "12")] == ["12.00", "12.02"]
+
+
+SAMPLE_PAGE = """<html><head><title>1.00 Musculoskeletal</title><style>p {}</style></head>
+<body><div id="nav">Home</div>
+<div class="region field-items"><h2>1.00 Musculoskeletal Disorders</h2>
+<p>Intro <b>text</b> here.</p><script>var x = 1;</script>
+<p>1.15 Disorders of the skeletal spine</p><p>  A. Documentation of criteria  </p>
+</div></body></html>"""
+
+
+def test_lxml_text_extraction_matches_bs4():
+    pytest.importorskip("lxml")
+    from scraper import extract_text_bs4, extract_text_lxml
+
+    assert extract_text_lxml(SAMPLE_PAGE) == extract_text_bs4(SAMPLE_PAGE)
+    assert extract_text_lxml(SAMPLE_PAGE).splitlines()[-2:] == [
+        "1.15 Disorders of the skeletal spine",
+        "A. Documentation of criteria",
+    ]
+
+
+def test_find_content_candidate_prefers_higher_priority_selector():
+    from bs4 import BeautifulSoup
+
+    from scraper import find_content_candidate
+
+    soup = BeautifulSoup(
+        '<main><div class="content"><div id="content">'
+        '<div class="field-items">Listings</div></div></div></main>',
+        "html.parser",
+    )
+    assert find_content_candidate(soup).get("class") == ["field-items"]
+
+    soup = BeautifulSoup('<main>Main</main><div role="main">Role</div>', "html.parser")
+    assert find_content_candidate(soup).get_text() == "Role"
+
+    assert find_content_candidate(BeautifulSoup("<p>None</p>", "html.parser")) is None
+
+
+def test_parse_section_cached_reparses_when_extractor_changes(tmp_path, monkeypatch):
+    import scraper
+
+    calls = []
+    monkeypatch.setattr(scraper, "RAW_HTML_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        scraper, "parse_section", lambda html, num, system: calls.append(num) or {"n": len(calls)}
+    )
+
+    assert scraper.parse_section_cached(SAMPLE_PAGE, "1", "Musculoskeletal") == {"n": 1}
+    assert scraper.parse_section_cached(SAMPLE_PAGE, "1", "Musculoskeletal") == {"n": 1}
+
+    other = "html.parser" if scraper.HTML_PARSER == "lxml" else "lxml"
+    monkeypatch.setattr(scraper, "HTML_PARSER", other)
+    assert scraper.parse_section_cached(SAMPLE_PAGE, "1", "Musculoskeletal") == {"n": 2}
+
+    # A pickle that fails to load for any reason is treated as a cache miss
+    (tmp_path / "section_1.pkl").write_bytes(b"garbage")
+    assert scraper.parse_section_cached(SAMPLE_PAGE, "1", "Musculoskeletal") == {"n": 3}
+
+
+def test_fetch_page_caches_non_utf8_pages_as_utf8(tmp_path, monkeypatch):
+    import requests
+
+    import scraper
+
+    response = requests.Response()
+    response.status_code = 200
+    response._content = "<p>1.15 Café – “criteria”</p>".encode("cp1252")
+    response.encoding = "cp1252"
+    monkeypatch.setattr(scraper, "RAW_HTML_DIR", str(tmp_path))
+    monkeypatch.setattr(scraper._rate_limiter, "wait", lambda url: None)
+    monkeypatch.setattr(scraper._SESSION, "get", lambda url, timeout: response)
+
+    live = scraper.fetch_page("https://www.ssa.gov/test", "1")
+    assert live == "<p>1.15 Café – “criteria”</p>"
+    assert scraper.fetch_from_local("1") == live